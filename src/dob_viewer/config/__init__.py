@@ -25,7 +25,10 @@ from nark.config import ConfigRoot
 from .custom_paste import DobViewerConfigCustomPaste  # noqa: F401 '<>' imported ...
 from .editor_keys import DobViewerConfigEditorKeys  # noqa: F401  ... but unused
 
-__all__ = ("DobConfigurableDev",)
+__all__ = (
+    "DobConfigurableDev",
+    "DobViewerConfigEditor",
+)
 
 
 # ***
@@ -47,3 +50,66 @@ class DobConfigurableDev(object):
     )
     def allow_mash_quit(self):
         return False
+
+
+# ***
+
+
+# (lb): The "editor" section is defined by dob-bright; these settings
+# are specific to the Carousel, so they're defined herein.
+@ConfigRoot.section("editor")
+class DobViewerConfigEditor(object):
+    """"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    # ***
+
+    @property
+    @ConfigRoot.setting(
+        _("Number of Facts to fetch from the store at once when traversing."),
+        hidden=True,
+    )
+    def fact_read_ahead(self):
+        return 20
+
+    # ***
+
+    @property
+    @ConfigRoot.setting(
+        _("Maximum number of undo (and redo) steps to remember, or 0 for no limit."),
+        hidden=True,
+    )
+    def undo_max_entries(self):
+        return 1000
+
+    # ***
+
+    @property
+    @ConfigRoot.setting(
+        _("Approximate memory cap, in bytes, on each undo and redo history."),
+        hidden=True,
+    )
+    def undo_max_bytes(self):
+        return 32 * 1024 * 1024
+
+    # ***
+
+    @property
+    @ConfigRoot.setting(
+        _("If True, journal unsaved edits and undo history, to recover after a crash."),
+        hidden=True,
+    )
+    def undo_journal(self):
+        return True
+
+    # ***
+
+    @property
+    @ConfigRoot.setting(
+        _("Number of undo journal records to write between each fsync."),
+        hidden=True,
+    )
+    def undo_journal_sync_every(self):
+        return 32
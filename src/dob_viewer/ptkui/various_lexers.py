@@ -17,6 +17,9 @@
 
 """"""
 
+from abc import abstractmethod
+from itertools import chain
+
 from prompt_toolkit.lexers import Lexer
 
 __all__ = (
@@ -28,12 +31,22 @@ __all__ = (
 )
 
 
+# The most lines' tokens to cache before starting over. This is more
+# than the screen shows, so scrolling back and forth mostly hits cache,
+# but it's bounded, so a 50k-line description doesn't stick around.
+LINE_CACHE_SIZE = 4096
+
+
 class BaseLexer(Lexer):
     """"""
 
     def __init__(self):
         super(BaseLexer, self).__init__()
         self._content_width = None
+        # Token lists by line text, so that lex_line is called once per
+        # distinct line, and not on every redraw of a document. (The same
+        # lexer is used for every Fact, so the cache spans documents.)
+        self._line_tokens = {}
 
     @property
     def content_width(self):
@@ -41,46 +54,68 @@ class BaseLexer(Lexer):
 
     @content_width.setter
     def content_width(self, content_width):
+        if content_width != self._content_width:
+            self._line_tokens.clear()
         self._content_width = content_width
 
+    # ***
+
+    def lex_document(self, document):
+        # prompt_toolkit only asks for the lines it shows, so only lex those.
+        lines = document.lines
+
+        def get_line(lineno):
+            return self.tokens_for_line(lines[lineno])
+
+        return get_line
+
+    def tokens_for_line(self, line):
+        try:
+            return self._line_tokens[line]
+        except KeyError:
+            pass
+        if len(self._line_tokens) >= LINE_CACHE_SIZE:
+            self._line_tokens.clear()
+        tokens = self.lex_line(line)
+        self._line_tokens[line] = tokens
+        return tokens
+
+    @abstractmethod
+    def lex_line(self, line):
+        """Returns the style and text tuples for one line of the document."""
+
 
 def wordwrapper():
     class WordWrappingLexer(BaseLexer):
         """A very basic, primitive, "dumb", split-on-space line splitter."""
 
         def lex_document(self, document):
-            splitdoc = []
-            for line in document.lines:
-                for chunk in line.split(" "):
-                    splitdoc.append(chunk)
+            # Split the document lazily, only as far as the line asked for.
+            chunks = []
+            splitter = chain.from_iterable(line.split(" ") for line in document.lines)
 
             def get_line(lineno):
-                line = splitdoc[lineno]
-                return [("#00ff55", line)]
+                while len(chunks) <= lineno:
+                    chunks.append(next(splitter))
+                return self.tokens_for_line(chunks[lineno])
 
             return get_line
 
+        def lex_line(self, line):
+            return [("#00ff55", line)]
+
     return WordWrappingLexer
 
 
 def truncater():
     class TruncatingLexer(BaseLexer):
-        @BaseLexer.content_width.setter
-        def content_width(self, content_width):
-            self._content_width = content_width
-            self.dots_cnt = 3
-            self.trunc_at = max(self.content_width - self.dots_cnt, 0)
+        DOTS_CNT = 3
 
-        def lex_document(self, document):
-            def get_line(lineno):
-                line = document.lines[lineno]
-                if self.content_width:
-                    if len(line) > self.content_width:
-                        line = line[: self.trunc_at]
-                        line += "━" * self.dots_cnt
-                return [("#00ff55", c) for c in line]
-
-            return get_line
+        def lex_line(self, line):
+            if self.content_width and len(line) > self.content_width:
+                trunc_at = max(self.content_width - self.DOTS_CNT, 0)
+                line = line[:trunc_at] + "━" * self.DOTS_CNT
+            return [("#00ff55", line)]
 
     return TruncatingLexer
 
@@ -88,16 +123,11 @@ def truncater():
 def rainbow():
     from prompt_toolkit.styles.named_colors import NAMED_COLORS
 
-    class RainbowLexer(BaseLexer):
-        def lex_document(self, document):
-            colors = list(sorted(NAMED_COLORS, key=NAMED_COLORS.get))
-
-            def get_line(lineno):
-                return [
-                    (colors[i % len(colors)], c)
-                    for i, c in enumerate(document.lines[lineno])
-                ]
+    # Sort the colors once, and not for every document.
+    colors = tuple(sorted(NAMED_COLORS, key=NAMED_COLORS.get))
 
-            return get_line
+    class RainbowLexer(BaseLexer):
+        def lex_line(self, line):
+            return [(colors[i % len(colors)], c) for i, c in enumerate(line)]
 
     return RainbowLexer
@@ -31,15 +31,33 @@ class ActionManager(object):
 
     def __init__(self, carousel):
         self.carousel = carousel
+        self.key_action_map = KeyActionMap(self.carousel)
+        self.bindings_generation = None
 
     # ***
 
     def standup(self):
-        self.key_action_map = KeyActionMap(self.carousel)
+        # The Carousel stands up anew after each trip to the act@gory, tags,
+        # or description prompt, but the key bindings only change if the
+        # config does. So only parse the config and build them when it does.
+        bindings_generation = self.key_bindings_generation()
+        if bindings_generation == self.bindings_generation:
+            return
         self.key_bonder = KeyBonder(
             config=self.carousel.controller.config,
         )
         self.setup_key_bindings()
+        self.bindings_generation = bindings_generation
+
+    def key_bindings_generation(self):
+        config = self.carousel.controller.config
+        return tuple(
+            tuple(sorted(config[section].as_dict().items()))
+            for section in (
+                KeyBonder.KEYBONDS_CFG_SECTION,
+                KeyBonder.FACTOID_CFG_SECTION,
+            )
+        )
 
     def finalize_standup(self):
         self.key_bonder.print_warnings()
@@ -102,6 +120,17 @@ class ActionManager(object):
     def unwire_keys_commando(self):
         self.unwire_keys_command_mode()
 
+    def wire_keys_saving(self):
+        # Drop any keys typed ahead, which the current key processor would
+        # otherwise still dispatch (using the bindings it has cached).
+        self.carousel.zone_manager.application.key_processor.empty_queue()
+        # The modal bindings are empty, so key presses are ignored.
+        self.saving_bindings = self._wire_keys(self.key_bindings_modal)
+
+    def unwire_keys_saving(self):
+        self._wire_keys(self.saving_bindings)
+        self.saving_bindings = None
+
     def wire_keys_delta_time(self):
         self.wire_keys_command_mode(self.key_bindings_delta_time)
 
@@ -20,12 +20,12 @@
 import asyncio
 import shutil
 import time
+from collections import deque
 from gettext import gettext as _
 
 import click_hotoffthehamster as click
 from dob_bright.styling.style_conf import color as styling_color
 from dob_bright.styling.style_engine import StyleEngine
-from dob_prompt.prompters.triple_prompter import ask_user_for_edits
 from easy_as_pypi_termio.errors import echoed_warnings_reset
 from inflector import English, Inflector
 from nark.helpers.dev.profiling import profile_elapsed
@@ -36,6 +36,7 @@ from ..ptkui.dialog_overlay import show_message
 from .action_manager import ActionManager
 from .edits_manager import EditsManager
 from .exceptions import catch_action_exception
+from .style_rules_cache import StyleRulesCache
 from .update_handler import UpdateHandler
 from .zone_content import ZoneContent
 from .zone_manager import ZoneManager
@@ -43,6 +44,26 @@ from .zone_manager import ZoneManager
 __all__ = ("Carousel",)
 
 
+# How many of the user's most recent jumps to consider when guessing
+# which direction they'll go next.
+PREFETCH_HINTS_WINDOW = 4
+
+# How long to wait after the user's last jump before warming the neighbors,
+# so that the prefetch never competes with a burst of key presses.
+PREFETCH_IDLE_SECS = 0.15
+
+# How long to yield to the user between each batch of a streaming import.
+STREAM_PAUSE_SECS = 0
+
+# How long to yield to the event loop after each save progress update. The
+# loop must be idle to paint promptly (PTK postpones redraws while it's busy).
+SAVE_PAUSE_SECS = 0.01
+
+# How long after each second boundary to refresh an active Fact's <now>,
+# so that the clock has surely rolled over when the tick wakes.
+TICK_PAST_SECOND_SECS = 0.01
+
+
 class Carousel(object):
     """"""
 
@@ -65,6 +86,7 @@ class Carousel(object):
             orig_facts=orig_facts,
             dirty_callback=dirty_callback,
             error_callback=self.error_callback,
+            recover_callback=self.recover_callback,
         )
         self.dry = dry
         self.content_lexer = content_lexer
@@ -72,7 +94,7 @@ class Carousel(object):
         self.no_completion = no_completion
         self.action_manager = ActionManager(self)
         self.update_handler = UpdateHandler(self)
-        # We'll set up the ZoneManager each time we use the event_loop.
+        # We'll set up the ZoneManager the first time we use the event_loop.
         self.zone_manager = None
         self._avail_width = None
         self.setup_async()
@@ -112,6 +134,9 @@ class Carousel(object):
         # - But we still need to be able to disable asyncio for tests.
         self._async_enable = True
         self._confirm_exit = False
+        self._prefetch_hints = deque(maxlen=PREFETCH_HINTS_WINDOW)
+        self._prefetch_event = None
+        self._tick_event = None
 
     @property
     def async_enable(self):
@@ -150,6 +175,11 @@ class Carousel(object):
 
         def setup_rules_confobj(rules_confobj):
             self.style_engine = StyleEngine(rules_confobj)
+            # Whenever the rules are (re)loaded, so is the results cache.
+            self.style_rules = StyleRulesCache(
+                self.style_engine,
+                self.controller.affirm,
+            )
 
         _setup_styling()
 
@@ -157,7 +187,7 @@ class Carousel(object):
         """Apply custom user classes from ~/.config/dob/styling/styles|rules.conf
         to, e.g., use custom color backgrounds for Facts with matching Category."""
         fact = fact or self.carousel.edits_manager.curr_edit
-        return self.style_engine.process_style_rules(ppt_widget, friendly_name, fact)
+        return self.style_rules.process_style_rules(ppt_widget, friendly_name, fact)
 
     # ***
 
@@ -174,6 +204,10 @@ class Carousel(object):
         #      # FIXME/2023-12-19 21:25: It's not running yet....
         #      #  self.event_loop = asyncio.get_running_loop()
         confirmed_facts = self.run_edit_loop(**kwargs)
+        if confirmed_facts:
+            self.edits_manager.drain_fact_stream()
+        self.edits_manager.redo_undo.log_memory_usage()
+        self.edits_manager.close_undo_journal()
 
         # (lb): We did not start the event loop, so we should not stop it, e.g.,:
         #     self.async_enable and self.event_loop and self.event_loop.stop()
@@ -298,6 +332,16 @@ class Carousel(object):
             confirmed = False
         return confirmed
 
+    def recover_callback(self, replayed):
+        question = _(
+            "\nRecover {} unsaved Fact(s) from a session that did not exit cleanly?"
+        ).format(len(replayed.edit_facts))
+        try:
+            confirmed = confirm(question, erase_when_done=True)
+        except KeyboardInterrupt:
+            confirmed = False
+        return confirmed
+
     def process_save_early(self):
         question = _("\nReally save without verifying all Facts?")
         confirmed = confirm(question, erase_when_done=True)
@@ -322,6 +366,9 @@ class Carousel(object):
         return used_prompt
 
     def prompt_user(self, edit_fact, used_prompt):
+        # Lazy-load the prompter, which the user might never open. ~ 0.015s.
+        from dob_prompt.prompters.triple_prompter import ask_user_for_edits
+
         used_prompt = ask_user_for_edits(
             self.controller,
             edit_fact,
@@ -342,8 +389,10 @@ class Carousel(object):
         return self.check_nak_if_errors_or_build_and_show(**kwargs)
 
     def managers_standup(self):
-        self.zone_manager = ZoneManager(self)
-        self.zone_manager.standup()
+        # Make the widgets once, and reuse them after each edit prompt.
+        if self.zone_manager is None:
+            self.zone_manager = ZoneManager(self)
+            self.zone_manager.standup()
         self.action_manager.standup()
         self.update_handler.standup()
         self.action_manager.finalize_standup()
@@ -501,6 +550,14 @@ class Carousel(object):
             tck_coro = self.tick_tock_now()
             tck_task = self.zone_manager.application.create_background_task(tck_coro)
 
+            # Start the neighbor prefetcher, which wakes up after the user jumps.
+            pft_coro = self.prefetch_neighbors()
+            pft_task = self.zone_manager.application.create_background_task(pft_coro)
+
+            # Pull the rest of a streaming import, between key presses.
+            stm_coro = self.stream_facts()
+            stm_task = self.zone_manager.application.create_background_task(stm_coro)
+
             # Run the carousel and wait for it to exit.
             await self.zone_manager.application.run_async()
 
@@ -509,9 +566,13 @@ class Carousel(object):
                 rerun = True
                 self.controller.client_logger.warning("KLUDGE! Re-running Carousel.")
 
-            # Cleanup the Clock tick.
+            # Cleanup the Clock tick, the prefetcher, and the import streamer.
             tck_task.cancel()
             await tck_task
+            pft_task.cancel()
+            await pft_task
+            stm_task.cancel()
+            await stm_task
 
             return rerun
 
@@ -519,34 +580,39 @@ class Carousel(object):
 
     # ***
 
+    def tick_wake(self):
+        """Wakes the clock tick, so it reconsiders when it next needs to run."""
+        if self._tick_event is not None:
+            self._tick_event.set()
+
     async def tick_tock_now(self):
         """"""
 
         async def _tick_tock_now():
+            self._tick_event = asyncio.Event()
             tocking = True
             while tocking:
                 tocking = await tick_tock_loop()
+            self._tick_event = None
 
         async def tick_tock_loop():
             if not await sleep_to_refresh():
                 return False
             refresh_viewable()
+            # Clear the wake after refreshing, which may itself call tick_wake.
+            self._tick_event.clear()
             return True
 
         async def sleep_to_refresh():
             try:
-                # (lb): I tried a few different behaviors here, e.g.,
-                # longer sleep, or even only updating if only so much
-                # time has passed (i.e., because we only need to update
-                # the "now" time, we only need to really redraw every
-                # second), but the seconds of the "now" time would visibly
-                # increment unevenly. I settled around 50 msecs. and it
-                # doesn't seem to make the user interaction at all sluggish.
-                # ... Hahaha, whelp, 50 msecs. makes 1 CPU run 100% hot.
-                # And 500 msecs. make 1 CPU run 20%, instead of 10....
-                # But if sleep is ⅔ secs., seconds increment is jumpy.
-                # 500 msecs. seems to work well.
-                await asyncio.sleep(0.5)
+                # (lb): This used to sleep 500 msecs. between refreshes,
+                # which kept the "now" seconds ticking evenly, but it cost
+                # a fifth of a CPU (and 50 msecs. ran one CPU 100% hot).
+                # - Now we only tick when something on screen follows the
+                # clock, and we sleep until the next second boundary, so
+                # the seconds still increment evenly. Otherwise, we sleep
+                # until tick_wake says the user did something.
+                await wait_for_tick(next_tick_delay())
             except asyncio.CancelledError:
                 return False
             except Exception as err:
@@ -555,6 +621,32 @@ class Carousel(object):
                 )
             return True
 
+        async def wait_for_tick(delay):
+            try:
+                await asyncio.wait_for(self._tick_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+        def next_tick_delay():
+            now = time.time()
+            delays = []
+            if showing_active_fact():
+                delays.append(1 - (now % 1) + TICK_PAST_SECOND_SECS)
+            notif_expiry = self.zone_manager.zone_lowdown.notif_expiry
+            if notif_expiry:
+                delays.append(max(notif_expiry - now, 0))
+            if not delays:
+                # Nothing to update until the user does something.
+                return None
+            return min(delays)
+
+        def showing_active_fact():
+            facts_diff = self.zone_manager.facts_diff
+            if facts_diff is None:
+                return False
+            # The duration, end time, and streamer show <now> for an open Fact.
+            return facts_diff.orig_fact.end is None or facts_diff.edit_fact.end is None
+
         def refresh_viewable():
             self.zone_manager.selectively_refresh()
             self.zone_manager.application.invalidate()
@@ -563,6 +655,117 @@ class Carousel(object):
 
     # ***
 
+    def prefetch_hint(self, direction):
+        """Records the direction of a fact jump, and wakes the prefetcher."""
+        self._prefetch_hints.append(direction)
+        if self._prefetch_event is not None:
+            self._prefetch_event.set()
+
+    async def prefetch_neighbors(self):
+        """"""
+
+        # (lb): Note that the store session is not thread-safe (and SQLite
+        # objects cannot be shared across threads), so rather than warm the
+        # neighbors in a worker thread, we wait for the user to go idle and
+        # then do the work on the event loop, between key presses.
+
+        async def _prefetch_neighbors():
+            self._prefetch_event = asyncio.Event()
+            prefetching = True
+            while prefetching:
+                prefetching = await prefetch_loop()
+            self._prefetch_event = None
+
+        async def prefetch_loop():
+            if not await wait_until_idle():
+                return False
+            warm_neighbors()
+            return True
+
+        async def wait_until_idle():
+            try:
+                await self._prefetch_event.wait()
+                # Keep waiting while the user is still jumping around.
+                while self._prefetch_event.is_set():
+                    self._prefetch_event.clear()
+                    await asyncio.sleep(PREFETCH_IDLE_SECS)
+            except asyncio.CancelledError:
+                return False
+            return True
+
+        def warm_neighbors():
+            trend = sum(self._prefetch_hints)
+            try:
+                self.warm_neighbors(forward=(trend >= 0), backward=(trend <= 0))
+            except Exception as err:
+                self.controller.client_logger.warning(
+                    "Unexpected prefetch err: {}".format(err),
+                )
+
+        await _prefetch_neighbors()
+
+    def warm_neighbors(self, forward=True, backward=True):
+        """Stages and pre-renders the Facts one step from the current Fact."""
+        self.edits_manager.conjoined.read_ahead_warm(
+            forward=forward,
+            backward=backward,
+        )
+        for orig_fact, edit_fact in self.edits_manager.neighbor_facts(
+            forward=forward,
+            backward=backward,
+        ):
+            self.zone_manager.prefetch_fact(orig_fact, edit_fact)
+
+    # ***
+
+    async def stream_facts(self):
+        """"""
+
+        # (lb): Like the prefetcher, pull on the event loop, and not from a
+        # worker thread, because the Facts manager is not thread-safe. Yield
+        # after each batch, so the user's key presses are not kept waiting.
+
+        async def _stream_facts():
+            streaming = True
+            while streaming:
+                streaming = await stream_loop()
+
+        async def stream_loop():
+            if not self.edits_manager.streaming:
+                return False
+            if not pull_facts():
+                return False
+            refresh_viewable()
+            try:
+                await asyncio.sleep(STREAM_PAUSE_SECS)
+            except asyncio.CancelledError:
+                return False
+            return True
+
+        def pull_facts():
+            try:
+                self.edits_manager.stream_facts()
+            except Exception as err:
+                # The error is raised again on save, but warn the user now.
+                self.controller.client_logger.warning(
+                    "Unexpected stream err: {}".format(err),
+                )
+                self.zone_manager.zone_lowdown.update_status(
+                    hot_notif=_("Import failed: {}").format(err),
+                )
+                self.zone_manager.application.invalidate()
+                return False
+            return True
+
+        def refresh_viewable():
+            # Update the lowdown's "New Fact n of m" count.
+            self.zone_manager.zone_lowdown.rebuild_viewable()
+            self.zone_manager.application.invalidate()
+
+        await _stream_facts()
+
+    # ***
+
     @catch_action_exception
     @ZoneContent.Decorators.reset_showing_help
     def exit_command(self, event):
@@ -600,21 +803,50 @@ class Carousel(object):
     @catch_action_exception
     @ZoneContent.Decorators.reset_showing_help
     def save_edited_and_exit(self, event):
-        self.save_edited_and_live(event)
-        # (lb): Exit Carousel, then Save. Traditional Import behavior
-        # (before running save/save_edited_and_live was implemented).
-        self.enduring_edit = False
-        event.app.exit()
-        return
+        async def exit_after_save():
+            # (lb): Exit Carousel, then Save. Traditional Import behavior
+            # (before running save/save_edited_and_live was implemented).
+            self.enduring_edit = False
+            event.app.exit()
+
+        self.save_edited_and_live(event, after_save=exit_after_save)
 
     @catch_action_exception
     @ZoneContent.Decorators.reset_showing_help
-    def save_edited_and_live(self, event):
+    def save_edited_and_live(self, event, after_save=None):
+        """"""
+        # Import save can take a while (because checks for conflicts on each
+        # Fact), but nothing is painted until the key binding handler returns.
+        # So save from a background task, which shows the progress as it goes.
+        # - Ignore key presses until saved, lest the user edit (or save, or
+        #   quit) mid-save, including any keys already typed after this one.
+        self.action_manager.wire_keys_saving()
+        self.zone_manager.application.create_background_task(
+            self.save_edited_task(after_save),
+        )
+
+    async def save_edited_task(self, after_save=None):
         """"""
-        # MAYBE/TESTME/2019-02-01: (lb): If running save on dob-import, use progger?
-        # - Import save can take a while (because checks for conflicts on each Fact)
-        #   -- do we need a Carousel progress display (progger)?
-        curr_fact, saved_facts = self.edits_manager.save_edited_facts()
+        saving = self.edits_manager.save_edited_facts_stepwise()
+        try:
+            while True:
+                try:
+                    saved_cnt, total_cnt = next(saving)
+                except StopIteration as stop:
+                    curr_fact, saved_facts = stop.value
+                    break
+                self.show_save_progress(saved_cnt, total_cnt)
+                await asyncio.sleep(SAVE_PAUSE_SECS)
+        finally:
+            # If cancelled (e.g., on exit), this rolls back the transaction.
+            saving.close()
+            self.action_manager.unwire_keys_saving()
+        self.show_saved_facts(curr_fact, saved_facts)
+        self.zone_manager.application.invalidate()
+        if after_save is not None:
+            await after_save()
+
+    def show_saved_facts(self, curr_fact, saved_facts):
         if saved_facts is None:
             # Indicates error during save, and error message was displayed.
             return
@@ -639,6 +871,17 @@ class Carousel(object):
             ),
         )
 
+    def show_save_progress(self, saved_cnt, total_cnt):
+        self.zone_manager.zone_lowdown.update_status(
+            hot_notif=_("Saving… {} of {} {}").format(
+                saved_cnt,
+                total_cnt,
+                Inflector(English).conditional_plural(total_cnt, "fact"),
+            ),
+        )
+        # The app redraws when save_edited_task yields to the event loop.
+        self.zone_manager.application.invalidate()
+
     # ***
 
     def error_callback(self, errmsg):
@@ -17,17 +17,27 @@
 
 """Fact Editing State Machine"""
 
+from collections.abc import Iterator
+
 from dob_bright.crud.fact_from_factoid import must_create_fact_from_factoid
+from sortedcontainers import SortedKeyList
 
 from .clipboard_edit import ClipboardEdit
+from .fact_stream import FactStream
 from .facts_manager import FactsManager
 from .group_chained import sorted_facts_list
-from .redo_undo_edit import RedoUndoEdit
+from .lazy_logger import LazyDebugLogger
+from .redo_undo_edit import RedoUndoEdit, revert_fact_deltas
 from .start_end_edit import StartEndEdit
+from .undo_journal import create_undo_journal
 
 __all__ = ("EditsManager",)
 
 
+# How many Facts to save between each save progress update.
+SAVE_PROGRESS_EVERY = 100
+
+
 class EditsManager(object):
     """"""
 
@@ -38,16 +48,21 @@ class EditsManager(object):
         orig_facts=None,
         dirty_callback=None,
         error_callback=None,
+        recover_callback=None,
     ):
         self.controller = controller
+        self.debug = LazyDebugLogger(controller.client_logger)
+        self.undo_journal = None
         self.setup_editing(edit_facts, orig_facts)
         self._dirty_callback = dirty_callback
         self.error_callback = error_callback
+        self.recover_journal(recover_callback)
 
     # ***
 
     def setup_editing(self, edit_facts, orig_facts):
         """"""
+        edit_facts = self.setup_fact_stream(edit_facts)
         self.setup_container(edit_facts, orig_facts)
         self.setup_edit_facts(edit_facts)
         self.setup_review_confirmation()
@@ -55,6 +70,65 @@ class EditsManager(object):
 
     # ***
 
+    def setup_fact_stream(self, edit_facts):
+        # A list of Facts is loaded all at once. But an iterator, e.g., a
+        # generator that parses a huge import, is streamed: the Carousel
+        # starts with the first batch, and pulls the rest in the background.
+        self.fact_stream = None
+        if not isinstance(edit_facts, Iterator):
+            return edit_facts
+        self.fact_stream = FactStream(edit_facts)
+        return self.fact_stream.pull()
+
+    @property
+    def streaming(self):
+        return self.fact_stream is not None and not self.fact_stream.exhausted
+
+    def stream_facts(self):
+        """Pulls the next batch of streamed Facts, and adds them to the Carousel."""
+        frontier = self.fact_stream.frontier
+        more_facts = self.fact_stream.pull()
+        for fact in more_facts:
+            self.controller.affirm(fact.orig_fact is None)
+            fact.orig_fact = 0
+        # Use the latest edit of the frontier Fact, which is what's in the group.
+        self.conjoined.append_facts(more_facts, self.conjoined.by_pk[frontier.pk])
+        for fact in more_facts:
+            if fact.dirty:
+                self.set_edit_fact(fact)
+            self.unviewed_fact_pks.add(fact.pk)
+        return more_facts
+
+    def drain_fact_stream(self):
+        while self.streaming:
+            self.stream_facts()
+
+    def stream_facts_before_jump(self, count=None):
+        # Pull streamed Facts until the jump cannot reach past the frontier
+        # (the final Fact pulled), lest the FactsManager think it's at the
+        # final Fact (and make an endless gap Fact), or load store Facts that
+        # would overlap Facts not yet pulled. A count of None means the jump
+        # is unbounded (e.g., to the final Fact), so pull them all.
+        while self.streaming and self.jump_passes_frontier(count):
+            self.stream_facts()
+
+    def jump_passes_frontier(self, count):
+        frontier = self.conjoined.by_pk[self.fact_stream.frontier.pk]
+        group, index = self.conjoined.locate_fact(frontier)
+        if count is None:
+            return True
+        if self.conjoined.curr_group is group:
+            return (index - self.conjoined.curr_index) < count
+        if self.curr_fact.start >= frontier.start:
+            # Any jump from past the frontier might land amongst Facts
+            # not yet pulled.
+            return True
+        # From an earlier group, the jump reaches the frontier's group
+        # first, so it passes the frontier only if it can pass its group.
+        return index < count
+
+    # ***
+
     def setup_container(self, edit_facts, orig_facts):
         def _setup_container():
             orig_lkup = orig_facts_lookup(orig_facts)
@@ -121,21 +195,103 @@ class EditsManager(object):
         # entered on command line; but will ignore fact read from store, e.g.,
         # `dob edit -1` will start up with an empty self.edit_facts (and the
         # one fact loaded from the store will be held in the conjoined.groups).
-        self.edit_facts = {fact.pk: fact for fact in edit_facts if fact.dirty}
+        self.edit_facts = {}
+        # Keep the edited Facts' PKs sorted, too, by each Fact's sorty_times
+        # when it was added, so prepared_facts and edit_fact_index need not
+        # sort all the edited Facts each time they're called.
+        self.edit_fact_keys = {}
+        self.edit_fact_pks = SortedKeyList(key=self.edit_fact_keys.__getitem__)
+        for fact in edit_facts:
+            if fact.dirty:
+                self.set_edit_fact(fact)
+
+    def set_edit_fact(self, edit_fact):
+        sorty_times = edit_fact.sorty_times
+        if self.edit_fact_keys.get(edit_fact.pk) != sorty_times:
+            self.pop_edit_fact(edit_fact.pk)
+            self.edit_fact_keys[edit_fact.pk] = sorty_times
+            self.edit_fact_pks.add(edit_fact.pk)
+        self.edit_facts[edit_fact.pk] = edit_fact
+
+    def pop_edit_fact(self, pk):
+        edit_fact = self.edit_facts.pop(pk, None)
+        if pk in self.edit_fact_keys:
+            self.edit_fact_pks.remove(pk)
+            del self.edit_fact_keys[pk]
+        return edit_fact
 
     # ***
 
     def setup_review_confirmation(self):
-        self.verify_fact_pks = set([fact.pk for fact in self.conjoined.facts])
-        self.viewed_fact_pks = set()
+        # Track the Facts the user has yet to see, rather than those they've
+        # seen, so the set shrinks as the user reviews (and streamed Facts
+        # are added as they're pulled).
+        self.unviewed_fact_pks = set([fact.pk for fact in self.conjoined.facts])
 
     # ***
 
     def setup_edit_help(self):
+        self.setup_undo_journal()
         self.setup_redo_undo()
         self.setup_clipboard()
         self.setup_time_edit()
 
+    def setup_undo_journal(self):
+        # Start the journal anew each time editing state is reset (i.e., on
+        # startup, and after saving), so it only holds unsaved edits. After
+        # saving, the Facts have new IDs, so it's a new session (and journal).
+        self.close_undo_journal()
+        self.undo_journal = create_undo_journal(self.controller, self.conjoined.facts)
+
+    def close_undo_journal(self):
+        # Called on clean exit and after saving, so there's nothing to recover.
+        if self.undo_journal is not None:
+            self.undo_journal.close(discard=True)
+
+    def recover_journal(self, recover_callback):
+        if self.undo_journal is None:
+            return
+        replayed = self.undo_journal.replay()
+        if self.undo_journal.locked_out:
+            self.controller.client_logger.warning(
+                "Another session is editing the same Facts; not journaling: {}".format(
+                    self.undo_journal.path,
+                )
+            )
+        # Discard the crashed session's journal, and journal the recovered
+        # edits anew (if the user wants them back).
+        self.undo_journal.close(discard=True)
+        if replayed and (recover_callback is not None) and recover_callback(replayed):
+            self.restore_journal(replayed)
+
+    def restore_journal(self, replayed):
+        """Restores the unsaved edits and undo history from a crashed session."""
+        # Pull the rest of a streamed import first, so that each recovered
+        # Fact replaces its import Fact, rather than being added on its own
+        # (and then added again, under a new PK, when it's streamed).
+        self.drain_fact_stream()
+        for edit_fact in replayed.edit_facts.values():
+            try:
+                group_fact = self.conjoined.by_pk[edit_fact.pk]
+            except KeyError:
+                self.add_facts([edit_fact])
+            else:
+                self.conjoined.apply_edits(
+                    edit_facts=[edit_fact], last_edits=[group_fact]
+                )
+            self.update_edited_fact(edit_fact, edit_fact.orig_fact)
+        for urt_changes in replayed.undo:
+            self.redo_undo.undo.append(urt_changes)
+        for urt_changes in replayed.redo:
+            self.redo_undo.redo.append(urt_changes)
+        self.controller.client_logger.info(
+            "Recovered {} unsaved fact(s) and {} undo(s) from: {}".format(
+                len(replayed.edit_facts),
+                len(replayed.undo),
+                self.undo_journal.path,
+            )
+        )
+
     def setup_redo_undo(self):
         self.redo_undo = RedoUndoEdit(self)
 
@@ -154,7 +310,7 @@ class EditsManager(object):
 
     @property
     def is_dirty(self):
-        return len(self.edit_facts) > 0
+        return len(self.edit_facts) > 0 or self.streaming
 
     # ***
 
@@ -165,13 +321,11 @@ class EditsManager(object):
     @curr_fact.setter
     def curr_fact(self, curr_fact):
         """"""
-        self.controller.client_logger.debug(
-            "\n- curr: {}".format(curr_fact.short),
-        )
+        self.debug("\n- curr: {}", lambda: curr_fact.short)
         if self.conjoined.curr_fact is not curr_fact:
             self.clipboard.reset_paste()
         self.conjoined.curr_fact = curr_fact
-        self.viewed_fact_pks.add(curr_fact.pk)
+        self.unviewed_fact_pks.discard(curr_fact.pk)
 
     def insert_fact(self, gap_fact):
         self.redo_undo.update_undo_altered([gap_fact], append=True)
@@ -182,7 +336,7 @@ class EditsManager(object):
 
     @property
     def user_viewed_all_new_facts(self):
-        return self.verify_fact_pks.issubset(self.viewed_fact_pks)
+        return not self.unviewed_fact_pks and not self.streaming
 
     @property
     def curr_edit(self):
@@ -202,6 +356,13 @@ class EditsManager(object):
     def curr_orig(self):
         return self.curr_fact.orig_fact or self.curr_fact
 
+    def neighbor_facts(self, forward=True, backward=True):
+        """Returns the (orig, edit) Fact pairs one step from the current Fact."""
+        return [
+            (fact.orig_fact or fact, self.edit_facts.get(fact.pk, fact))
+            for fact in self.conjoined.read_ahead_neighbors(forward, backward)
+        ]
+
     # ***
 
     @property
@@ -210,7 +371,7 @@ class EditsManager(object):
 
     @property
     def edit_fact_index(self):
-        return sorted_facts_list(self.edit_facts.values()).index(self.curr_fact)
+        return self.edit_fact_pks.index(self.curr_fact.pk)
 
     # ***
 
@@ -219,9 +380,16 @@ class EditsManager(object):
         """
         Returns list of edited & new facts to persist (to database, export file, etc.).
         """
-        prepared_facts_from_edit = sorted_facts_list(self.edit_facts.values())
-        prepared_facts_from_view = [fact for fact in self.conjoined.facts if fact.dirty]
-        self.controller.affirm(prepared_facts_from_edit == prepared_facts_from_view)
+        prepared_facts_from_edit = [self.edit_facts[pk] for pk in self.edit_fact_pks]
+        if self.controller.config["dev.catch_errors"]:  # Walks all the Facts.
+            prepared_facts_from_view = [
+                fact for fact in self.conjoined.facts if fact.dirty
+            ]
+            self.controller.affirm(prepared_facts_from_edit == prepared_facts_from_view)
+            self.controller.affirm(
+                prepared_facts_from_edit
+                == list(sorted_facts_list(self.edit_facts.values()))
+            )
         return prepared_facts_from_edit
 
     # ***
@@ -342,14 +510,15 @@ class EditsManager(object):
         self.controller.affirm((orig_fact == 0) or (edit_fact.pk == orig_fact.pk))
         if edit_fact.dirty:
             # Update or add reference to latest edit.
-            self.edit_facts[edit_fact.pk] = edit_fact
+            self.set_edit_fact(edit_fact)
+            if self.undo_journal is not None:
+                self.undo_journal.edited_fact(edit_fact)
         elif orig_fact != 0:
             self.controller.affirm(not orig_fact.dirty)
-            try:
-                # Forget edited fact that's no longer different than orig.
-                self.edit_facts.pop(orig_fact.pk)  # Ignoring: popped fact.
-            except KeyError:
-                pass
+            # Forget edited fact that's no longer different than orig.
+            forgot_fact = self.pop_edit_fact(orig_fact.pk)
+            if (forgot_fact is not None) and (self.undo_journal is not None):
+                self.undo_journal.forgot_fact(orig_fact.pk)
 
     # ***
 
@@ -373,7 +542,7 @@ class EditsManager(object):
             Ensure at least 1 fact is loaded, because
             there is no empty Carousel state!.
             """
-            if len(list(self.conjoined.facts)):
+            if len(self.conjoined):
                 return
             at_least_load_latest_fact()
 
@@ -418,6 +587,21 @@ class EditsManager(object):
         self.curr_fact = self.conjoined.locate_wired(pristine[0])
         self.dirty_callback()
 
+    def restore_deltas(self, deltas, pks):
+        # The deltas only know the PKs of the Facts they change,
+        # so look up the live Facts, and revert those.
+        live_facts = [self.conjoined.by_pk[pk] for pk in pks]
+
+        with self.conjoined.facts_unwired(live_facts):
+            revert_fact_deltas(live_facts, deltas)
+
+        for live_fact in live_facts:
+            self.update_edited_fact(live_fact, live_fact.orig_fact)
+
+        self.curr_fact = self.conjoined.locate_wired(live_facts[0])
+        self.dirty_callback()
+        return live_facts
+
     # ***
 
     def fact_copy_activity(self):
@@ -569,71 +753,105 @@ class EditsManager(object):
 
     def jump_fact_dec(self, count=1):
         """"""
-        for idx in range(count):
-            prev_fact = self.conjoined.jump_fact_dec()
-            if prev_fact is None:
-                return prev_fact
-            elif prev_fact.dirty:
-                self.update_edited_fact(prev_fact, prev_fact.orig_fact)
+        self.stream_facts_before_jump(count=0)
+        from_fact = self.curr_fact
+        prev_fact = self.conjoined.jump_fact_dec(count=count)
+        self.manage_passed_facts(from_fact, prev_fact, backtrack="next_fact")
         return prev_fact
 
     def jump_fact_inc(self, count=1):
         """"""
-        next_fact = None
-        for idx in range(count):
-            next_fact = self.conjoined.jump_fact_inc()
-            if next_fact is None:
-                return next_fact
-            elif next_fact.dirty:
-                self.update_edited_fact(next_fact, next_fact.orig_fact)
+        self.stream_facts_before_jump(count=count)
+        from_fact = self.curr_fact
+        next_fact = self.conjoined.jump_fact_inc(count=count)
+        self.manage_passed_facts(from_fact, next_fact, backtrack="prev_fact")
         return next_fact
 
+    def manage_passed_facts(self, from_fact, jump_fact, backtrack):
+        # The FactsManager only signals the final fact of a multi-fact jump,
+        # but it wired each fact along the way, and any one of them might've
+        # been edited (e.g., to fix an overlap), so walk back and check them.
+        passed_fact = jump_fact
+        while (passed_fact is not None) and (passed_fact is not from_fact):
+            if passed_fact.dirty:
+                self.update_edited_fact(passed_fact, passed_fact.orig_fact)
+            self.unviewed_fact_pks.discard(passed_fact.pk)
+            passed_fact = getattr(passed_fact, backtrack)
+
     # ***
 
     def jump_day_dec(self, days=1):
         """"""
+        self.stream_facts_before_jump(count=0)
         return self.conjoined.jump_day_dec(days=days)
 
     def jump_day_inc(self, days=1):
         """"""
+        self.stream_facts_before_jump()
         return self.conjoined.jump_day_inc(days=days)
 
     # ***
 
     def jump_rift_dec(self):
         """"""
+        self.stream_facts_before_jump(count=0)
         self.conjoined.jump_rift_dec()
 
     def jump_rift_inc(self):
         """"""
+        self.stream_facts_before_jump()
         self.conjoined.jump_rift_inc()
 
     # ***
 
     def jump_fact_first(self):
         """"""
+        self.stream_facts_before_jump(count=0)
         self.conjoined.jump_fact_first()
 
     def jump_fact_final(self):
         """"""
+        self.stream_facts_before_jump()
         self.conjoined.jump_fact_final()
 
     # ***
 
-    def save_edited_facts(self):
+    def save_edited_facts(self, progress=None):
         """"""
+        saving = self.save_edited_facts_stepwise()
+        while True:
+            try:
+                saved_cnt, total_cnt = next(saving)
+            except StopIteration as stop:
+                return stop.value
+            if progress is not None:
+                progress(saved_cnt, total_cnt)
+
+    def save_edited_facts_stepwise(self):
+        """
+        Saves the edited Facts, yielding the progress, (saved_cnt, total_cnt),
+        every SAVE_PROGRESS_EVERY Facts (and after the last one), so the caller
+        can show it, and then returns (keep_fact, saved_facts).
+        """
         # 2019-01-23 22:28: (lb): I wrote this quick in the past hour.
         # Seems to work. Guess we'll see how stable it is!
 
         def _save_edited_facts():
+            # Save the whole import, not just the Facts pulled so far.
+            self.drain_fact_stream()
             curr_fact = self.curr_fact
             # 2019-01-23 20:46: Just assume the Carousel handled conflicts?
             # LATER/BACKLOG: What about if store changed in background?
             #   - Or would changed Facts have PK marked deleted?
             #     Would error propagate on changed db?
             edited_facts = self.prepared_facts
-            ignore_pks = [fact.pk for fact in edited_facts]
-            keep_fact, saved_facts = save_edited_trustworthy(
+            # Only Facts already in the store can conflict with themselves, so
+            # skip new Facts' PKs (None, or negative), which keeps the store's
+            # conflict query short, e.g., on import, when all Facts are new.
+            ignore_pks = set(
+                fact.pk for fact in edited_facts if fact.pk and fact.pk > 0
+            )
+            keep_fact, saved_facts = yield from save_edited_transaction(
                 edited_facts,
                 ignore_pks,
             )
@@ -641,28 +859,73 @@ class EditsManager(object):
             # Return fact for zone_manager to jump to.
             return keep_fact, saved_facts
 
-        def save_edited_trustworthy(edited_facts, ignore_pks):
+        def save_edited_transaction(edited_facts, ignore_pks):
+            # Save all the Facts in one store transaction, so that all or none
+            # are saved. Each facts.save() commits, so wrap each one in its own
+            # SAVEPOINT, which that commit releases, and then commit (or roll
+            # back) the outer transaction after the last Fact.
+            session = self.controller.store.session
+            session.commit()
+            if self.controller.config["db.engine"] == "sqlite":
+                # (lb): pysqlite does not BEGIN until the first INSERT or UPDATE,
+                # so the first SAVEPOINT would start (and its RELEASE would
+                # commit) the transaction. So BEGIN it ourselves.
+                session.connection().exec_driver_sql("BEGIN")
+            save_states = [fact_save_state(fact) for fact in edited_facts]
+            try:
+                keep_fact, saved_facts = yield from save_edited_trustworthy(
+                    edited_facts,
+                    ignore_pks,
+                    session,
+                )
+            except BaseException:
+                # Including GeneratorExit, if the caller stops saving midway,
+                # e.g., the Carousel's save task is cancelled on exit.
+                rollback_transaction(session, edited_facts, save_states)
+                raise
+            if saved_facts is None:
+                rollback_transaction(session, edited_facts, save_states)
+                return save_edited_fact_failed()
+            session.commit()
+            return keep_fact, saved_facts
+
+        def rollback_transaction(session, edited_facts, save_states):
+            while session.in_nested_transaction():
+                session.rollback()
+            session.rollback()
+            for edit_fact, save_state in zip(edited_facts, save_states):
+                restore_fact_save_state(edit_fact, save_state)
+
+        def save_edited_trustworthy(edited_facts, ignore_pks, session):
             keep_fact = None
             saved_facts = []
-            for edit_fact in edited_facts:
+            for idx, edit_fact in enumerate(edited_facts):
+                session.begin_nested()
                 new_fact = save_edited_fact(edit_fact, ignore_pks)
                 if new_fact is None:
-                    return save_edited_fact_failed()
+                    return None, None
                 saved_facts.append(new_fact)
                 if edit_fact is self.curr_fact:
                     keep_fact = new_fact
                 affirm_saved_edited_fact(edit_fact, new_fact)
+                saved_cnt = idx + 1
+                if not (saved_cnt % SAVE_PROGRESS_EVERY) or (
+                    saved_cnt == len(edited_facts)
+                ):
+                    yield saved_cnt, len(edited_facts)
             return keep_fact, saved_facts
 
+        def fact_save_state(fact):
+            # The store's save might change these, even if the save fails.
+            return (fact.pk, fact.deleted, fact.split_from)
+
+        def restore_fact_save_state(fact, save_state):
+            fact.pk, fact.deleted, fact.split_from = save_state
+
         def save_edited_fact_failed():
             # Something went wrong, and we displayed an error.
-            # Return now, and leave the store in a Bad State.
-            # Users are encouraged to keep their data stores
-            # under revision control so that they can recover
-            # from blunders such as these. And we should make
-            # sure our code is tough and resilient and stable.
-            # I.e., we don't need to bother handling this error
-            # better; just don't cause an error.
+            # The store transaction was rolled back, and the edited Facts
+            # restored, so the user can fix the problem and try again.
             return None, None  # Short-circuit return!
 
         def save_edited_fact(edit_fact, ignore_pks):
@@ -670,9 +933,7 @@ class EditsManager(object):
             if edit_fact.pk and edit_fact.pk < 0:
                 edit_fact.pk = None
             if edit_fact.pk is None and edit_fact.deleted:
-                self.controller.client_logger.debug(
-                    "Deleted fact: {}".format(edit_fact.short)
-                )
+                self.debug("Deleted fact: {}", lambda: edit_fact.short)
                 return []
             try:
                 return self.controller.facts.save(
@@ -736,4 +997,4 @@ class EditsManager(object):
             self.curr_fact = keep_fact
             return keep_fact
 
-        return _save_edited_facts()
+        return (yield from _save_edited_facts())
@@ -0,0 +1,66 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Pulls Facts from a (possibly huge) import in batches, as the Carousel runs."""
+
+__all__ = ("FactStream",)
+
+
+# How many Facts to pull from the import at a time. Each pull runs on
+# the event loop, between key presses, so keep it snappy.
+STREAM_BATCH_SIZE = 100
+
+
+class FactStream(object):
+    """
+    Wraps an iterator (or generator) of parsed Facts, such that the
+    Carousel can show the first batch while the rest are still parsed.
+
+    The stream remembers the final Fact it pulled, the frontier, so the
+    EditsManager knows where the unpulled Facts will be placed.
+    """
+
+    def __init__(self, facts, batch_size=None):
+        self.facts = iter(facts)
+        self.batch_size = batch_size or STREAM_BATCH_SIZE
+        self.frontier = None
+        self.exhausted = False
+        self.pulled_count = 0
+        self.error = None
+
+    def pull(self):
+        """Returns the next batch of Facts, or the empty list when exhausted."""
+        batch = []
+        while (
+            not self.exhausted and self.error is None and len(batch) < self.batch_size
+        ):
+            try:
+                batch.append(next(self.facts))
+            except StopIteration:
+                self.exhausted = True
+            except Exception as err:
+                # Hold onto the parse error until the Facts parsed before
+                # it are placed, and then keep raising it, rather than
+                # pretending we're done, so the caller does not save an
+                # incomplete import.
+                self.error = err
+        if not batch and self.error is not None:
+            raise self.error
+        if batch:
+            self.frontier = batch[-1]
+            self.pulled_count += len(batch)
+        return batch
@@ -26,10 +26,12 @@ from .facts_mgr_fact_inc import FactsManager_FactInc
 from .facts_mgr_gap import FactsManager_Gap
 from .facts_mgr_jump import FactsManager_Jump
 from .facts_mgr_jump_time import FactsManager_JumpTime
+from .facts_mgr_read_ahead import FactsManager_ReadAhead
 from .facts_mgr_rift import FactsManager_Rift
 from .facts_mgr_rift_dec import FactsManager_RiftDec
 from .facts_mgr_rift_inc import FactsManager_RiftInc
 from .group_chained import GroupChained
+from .lazy_logger import LazyDebugLogger
 
 __all__ = ("FactsManager",)
 
@@ -40,6 +42,7 @@ class FactsManager(
     FactsManager_Gap,
     FactsManager_Jump,
     FactsManager_JumpTime,
+    FactsManager_ReadAhead,
     FactsManager_Rift,
     FactsManager_RiftDec,
     FactsManager_RiftInc,
@@ -54,10 +57,15 @@ class FactsManager(
         self.controller = controller
         self.on_insert_fact = on_insert_fact
         self.on_jumped_fact = on_jumped_fact
-        self.debug = controller.client_logger.debug
+        self.debug = LazyDebugLogger(controller.client_logger)
         self.groups = self.sorted_contiguous_facts_list()
         self.by_pk = {}
+        # Track the number of facts, rather than summing the groups' lengths.
+        # - Note that collapsing two groups into one does not change the count.
+        self.fact_count = 0
         self.last_fact_pk = 0
+        # The PKs of the gap Facts we made, which a streamed Fact may reuse.
+        self.gap_fact_pks = set()
         self._curr_fact = None
         self.curr_group = None
         self.curr_index = None
@@ -68,6 +76,35 @@ class FactsManager(
         )
         return sorted_contiguous_facts_list
 
+    def add_group(self, group):
+        # Remember the key the group was sorted by, because its sorty_times
+        # might change while it's in the list, and then groups.index (which
+        # bisects on the key) would not find it. See group_index().
+        group.groups_key = group.sorty_times
+        self.groups.add(group)
+
+    def group_index(self, group):
+        if group.groups_key is None:
+            return None
+        # Bisect using the key the group was added with (which matches the
+        # key SortedKeyList has on record), and then step past any groups
+        # with the same key (e.g., two groups that both just claim time).
+        index = self.groups.bisect_key_left(group.groups_key)
+        while (index < len(self.groups)) and (
+            self.groups[index].groups_key == group.groups_key
+        ):
+            if self.groups[index] is group:
+                return index
+            index += 1
+        # The group thinks it's in the list, but it's not where its key says.
+        raise ValueError("Group is not in list: {0}".format(group))
+
+    def pop_group(self, index):
+        group = self.groups.pop(index)
+        # So that group_index knows the group is no longer in the list.
+        group.groups_key = None
+        return group
+
     # ***
 
     @property
@@ -124,7 +161,7 @@ class FactsManager(
         raise TypeError("'{0}' object is not really subscriptable".format(type(self)))
 
     def __len__(self):
-        return sum([len(group) for group in self.groups])
+        return self.fact_count
 
     @property
     def debug__str(self):
@@ -150,10 +187,41 @@ class FactsManager(
         # FIXME/2019-12-06: (lb): Just testing. Remove affirm arg. later.
         # group = GroupChained(grouped_facts)
         group = GroupChained(grouped_facts, affirm=self.controller.affirm)
-        self.groups.add(group)
+        self.add_group(group)
+        self.fact_count += len(grouped_facts)
 
         self.logger_debug_groups("add_facts", group=group)
 
+    def append_facts(self, facts, after_fact):
+        """Adds Facts to the group of after_fact, e.g., from a streaming import."""
+        if not facts:
+            return
+
+        for fact in facts:
+            if (fact.pk in self.by_pk.keys()) and (fact.pk not in self.gap_fact_pks):
+                # Refuse a Fact that was already added, lest it show up twice.
+                raise ValueError("Fact is already added: {0}".format(fact.pk))
+
+        group, _index = self.locate_fact(after_fact)
+        with self.fact_group_rekeyed(group):
+            for fact in facts:
+                if fact.pk in self.by_pk.keys():
+                    # The import numbered its new Facts before we made any
+                    # of our own, e.g., a gap Fact made before this Fact was
+                    # pulled might have claimed its PK. So give it another.
+                    self.controller.affirm(fact.unstored)
+                    self.last_fact_pk -= 1
+                    fact.pk = self.last_fact_pk
+                # Leave the Facts unwired; the _inc/_dec methods wire them.
+                group.add(fact)
+                self.by_pk[fact.pk] = fact
+                if fact.unstored:
+                    self.last_fact_pk = min(self.last_fact_pk, fact.pk)
+            self.fact_count += len(facts)
+        if group is self.curr_group:
+            # In case any Fact sorted before the current one.
+            self.curr_index = group.index(self.curr_fact)
+
     def claim_time_span(self, since, until):
         owning_group = None
 
@@ -198,42 +266,62 @@ class FactsManager(
 
         with self.fact_group_rekeyed(group):
             # Clear time windows of edited facts, as times may have changed.
-            for last_edit in last_edits:
-                last_index = group.index(last_edit)
-                group_fact = group.pop(last_index)
-                # 2020-04-09: (lb): I had this affirm here:
-                #   self.controller.affirm(group_fact == last_edit)
-                # which meant to say that the Fact in the Fact Manager
-                # group matches the most recent Fact edit, i.e., the
-                # group fact has not been updated yet.
-                # However, on time edit, the apply_edit_time_start/end
-                # methods update the editable fact, but the editable
-                # facts are also part of the Facts Manager groups. So
-                # while group_fact.pk == last_edit.pk, other attrs might
-                # now differ.
-                self.controller.affirm(
-                    (group_fact == last_edit) or (group_fact in edit_facts)
-                )
-
-                if group_fact.has_prev_fact:
-                    group_fact.prev_fact.next_fact = None
-                if group_fact.has_next_fact:
-                    group_fact.next_fact.prev_fact = None
-
-                group_fact.prev_fact = None
-                group_fact.next_fact = None
-
-                del self.by_pk[group_fact.pk]
-
-            for edit_fact in edit_facts:
-                # Rather than try to rewire the Facts, e.g., by calling
-                #   self.new_fact_wire_links(edit_fact)
-                # leave the Facts unwired, and let the normal _inc/_dec
-                # navigation methods fix the wiring.
-                edit_fact.next_fact = None
-                edit_fact.prev_fact = None
-                group.add(edit_fact)
-                self.by_pk[edit_fact.pk] = edit_fact
+            self.unwire_facts(group, last_edits, edit_facts)
+            self.wire_facts(group, edit_facts)
+
+    @contextmanager
+    def facts_unwired(self, wired_facts):
+        # Lets the caller edit the wired Facts in place (e.g., to undo changes),
+        # which is otherwise verboten (see EditsManager.editable_fact). Unwire
+        # the Facts while the group can still find them by their current times,
+        # and then rewire them after the caller is done editing them.
+        group, _index = self.locate_fact(wired_facts[0])
+
+        with self.fact_group_rekeyed(group):
+            self.unwire_facts(group, wired_facts, wired_facts)
+            yield
+            self.wire_facts(group, wired_facts)
+
+    def unwire_facts(self, group, last_edits, edit_facts):
+        for last_edit in last_edits:
+            last_index = group.index(last_edit)
+            group_fact = group.pop(last_index)
+            # 2020-04-09: (lb): I had this affirm here:
+            #   self.controller.affirm(group_fact == last_edit)
+            # which meant to say that the Fact in the Fact Manager
+            # group matches the most recent Fact edit, i.e., the
+            # group fact has not been updated yet.
+            # However, on time edit, the apply_edit_time_start/end
+            # methods update the editable fact, but the editable
+            # facts are also part of the Facts Manager groups. So
+            # while group_fact.pk == last_edit.pk, other attrs might
+            # now differ.
+            self.controller.affirm(
+                (group_fact == last_edit) or (group_fact in edit_facts)
+            )
+
+            if group_fact.has_prev_fact:
+                group_fact.prev_fact.next_fact = None
+            if group_fact.has_next_fact:
+                group_fact.next_fact.prev_fact = None
+
+            group_fact.prev_fact = None
+            group_fact.next_fact = None
+
+            del self.by_pk[group_fact.pk]
+            self.fact_count -= 1
+
+    def wire_facts(self, group, edit_facts):
+        for edit_fact in edit_facts:
+            # Rather than try to rewire the Facts, e.g., by calling
+            #   self.new_fact_wire_links(edit_fact)
+            # leave the Facts unwired, and let the normal _inc/_dec
+            # navigation methods fix the wiring.
+            edit_fact.next_fact = None
+            edit_fact.prev_fact = None
+            group.add(edit_fact)
+            self.by_pk[edit_fact.pk] = edit_fact
+            self.fact_count += 1
 
     # ***
 
@@ -252,41 +340,23 @@ class FactsManager(
         # group if its sorty_times < _maxes.)
         group = group or self.curr_group
         if group_index is None:
-            # MAYBE/2019-01-21: self.groups.index will raise ValueError
-            #  if you edited the first or final fact while the group is
-            #  still part of the sorted_contiguous_facts_list() container.
-            # This is not, like, a moral issue, or anything, but for the
-            #  sake of our code, anything that changes the group should
-            #  be aware of this.
-            # However, if we find that maintaining the code as such starts
-            #  to become painful -- should this dance become more difficult
-            #  -- we could fallback and walk self.groups for an object match.
-            try:
-                group_index = self.groups.index(group)
-            except ValueError:
-                # MAYBE/2019-01-21: See long comment from a few lines back.
-                #  Look for exact group object match (i.e., instead of using
-                #  sorty_times value). This is because groups.index uses
-                #  _maxes and compares key values, ignoring object identity.
-                #   and group.sorty_times changes based on its facts, and
-                #   when we extend the time window. (lb): Long comment....
-                self.controller.affirm(False)  # Unexpected path, but may work:
-                for idx, grp in enumerate(self.groups):
-                    if grp is group:
-                        group_index = idx
-                        break
-                if group_index is None:
-                    raise
+            # Note that group_index uses the key the group was added with,
+            # and not its current sorty_times, which might already differ,
+            # e.g., if you edited the first or final fact while the group
+            # is still part of the sorted_contiguous_facts_list() container.
+            # - If the group is not in the list, e.g., it's a new group
+            #   claiming time, there's nothing to pop.
+            group_index = self.group_index(group)
 
         if group_index is not None:
             # NOTE: Use pop(), specifying an index, rather than remove(),
             #       which uses a key value, because sorty_times might already
             #       be invalid.
-            self.groups.pop(group_index)
+            self.pop_group(group_index)
 
         yield
 
-        self.groups.add(group)
+        self.add_group(group)
 
         self.logger_debug_groups("fact_group_rekeyed", group=group)
 
@@ -295,13 +365,12 @@ class FactsManager(
     def logger_debug_groups(self, whence="", group=None):
         group = group or self.curr_group
         self.debug(
-            "{}\n- group.sorty_times: {}\n-    groups._maxes: {}".format(
-                whence,
-                group and group.sorty_times or "<curr_group is None>",
-                self.groups._maxes,
-            )
+            "{}\n- group.sorty_times: {}\n-    groups._maxes: {}",
+            whence,
+            group and group.sorty_times or "<curr_group is None>",
+            lambda: self.groups._maxes,
         )
-        self.debug("\n{}".format(self.debug__str))
+        self.debug("\n{}", lambda: self.debug__str)
 
     def curr_group_add(self, some_fact):
         # The new fact is not yet wired.
@@ -316,6 +385,7 @@ class FactsManager(
         with self.fact_group_rekeyed():
             self.curr_group.add(some_fact)
             self.by_pk[some_fact.pk] = some_fact
+            self.fact_count += 1
 
     def new_fact_wire_links(self, some_fact):
         # 2019-02-13: (lb): Just a *momentaneous* FYI (Feature should be all wired now)
@@ -359,4 +429,5 @@ class FactsManager(
             return None
         group_fact = self.groups[-1].pop(-1)
         self.controller.affirm(group_fact is final_fact)
+        self.fact_count -= 1
         return group_fact
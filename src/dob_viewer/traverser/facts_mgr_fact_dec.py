@@ -43,10 +43,37 @@ class FactsManager_FactDec(object):
         #     but for now, using 100 yrs. ago.
         self.beginning_of_time = controller.now - (100 * JULIAN_YEAR)
 
-    def jump_fact_dec(self):
+    def jump_fact_dec(self, count=1):
         """"""
 
         def _jump_fact_dec():
+            from_fact = self.curr_fact
+            prev_fact = None
+            # For a [count]k jump, widen the read-ahead window so that all
+            # the steps are served from one range query, and hold off on
+            # signaling the jump until we've landed on the final fact.
+            with self.read_ahead_batch(count, forward=False):
+                for idx in range(count):
+                    step_fact = step_fact_dec()
+                    if step_fact is None:
+                        break
+                    prev_fact = step_fact
+                    # The steps use curr_fact to track progress, but we
+                    # set it directly, and not via the setter, so as not to
+                    # relocate the fact (which we already know the location of).
+                    self._curr_fact = prev_fact
+            # Restore curr_fact, so that the jump callback sees the change.
+            self._curr_fact = from_fact
+            if prev_fact is None:
+                return None
+            # We (re)wired the facts to the group earlier; now rewire the group.
+            self.fulfill_jump(prev_fact, reason="fact-dec")
+            self.debug("\n- prev: {}", lambda: prev_fact.short)
+            return prev_fact
+
+        # ***
+
+        def step_fact_dec():
             # Check first if we've reached the beginning of time.
             is_first_fact = self.curr_index == 0
             if is_first_fact and self.curr_group.since_time_began:
@@ -70,14 +97,11 @@ class FactsManager_FactDec(object):
             #   maybe self.curr_group, but not self.curr_fact (so the state
             #   is outta sorts).
             self.controller.affirm(self.curr_fact.start >= prev_fact.end)
-            # We (re)wired the fact to the group earlier; now rewire the group.
-            self.fulfill_jump(prev_fact, reason="fact-dec")
             # See if we've identified the boundary of the known factiverse.
             if prev_fact.start <= self.beginning_of_time:
                 with self.fact_group_rekeyed():
                     self.curr_group.claim_time_span(since=SinceTimeBegan)
                 self.controller.affirm(self.curr_group.since_time_began)
-            self.controller.client_logger.debug("\n- prev: {}".format(prev_fact.short))
             return prev_fact
 
         # ***
@@ -158,7 +182,7 @@ class FactsManager_FactDec(object):
             return True
 
         def fetch_prev_group():
-            prev_group_index = self.groups.index(self.curr_group) - 1
+            prev_group_index = self.group_index(self.curr_group) - 1
             if prev_group_index >= 0:
                 return self.groups[prev_group_index], prev_group_index
             return None, None
@@ -175,7 +199,7 @@ class FactsManager_FactDec(object):
         def collapse_group(prev_group, prev_group_index):
             prev_fact = prev_group[-1]
             with self.fact_group_rekeyed():
-                _prev_group = self.groups.pop(prev_group_index)
+                _prev_group = self.pop_group(prev_group_index)
                 self.controller.affirm(prev_group is _prev_group)
                 self.curr_index = len(prev_group) - 1
                 # Note that addition returns a new object, e.g.,
@@ -254,7 +278,9 @@ class FactsManager_FactDec(object):
         # Search backward from the start time of the group (rather than,
         # say, calling antecedent(self.curr_fact)), so that we skip time
         # that's currently under our control.
-        prev_from_store = self.controller.facts.antecedent(
+        # - Note that read_ahead_antecedent stages a window of Facts from the
+        #   store, so that stepping backward does not query once per Fact.
+        prev_from_store = self.read_ahead_antecedent(
             fact=ref_fact,
             ref_time=ref_time,
         )
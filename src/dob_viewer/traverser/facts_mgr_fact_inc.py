@@ -30,10 +30,37 @@ __all__ = ("FactsManager_FactInc",)
 class FactsManager_FactInc(object):
     """"""
 
-    def jump_fact_inc(self):
+    def jump_fact_inc(self, count=1):
         """"""
 
         def _jump_fact_inc():
+            from_fact = self.curr_fact
+            next_fact = None
+            # For a [count]j jump, widen the read-ahead window so that all
+            # the steps are served from one range query, and hold off on
+            # signaling the jump until we've landed on the final fact.
+            with self.read_ahead_batch(count, forward=True):
+                for idx in range(count):
+                    step_fact = step_fact_inc()
+                    if step_fact is None:
+                        break
+                    next_fact = step_fact
+                    # The steps use curr_fact to track progress, but we
+                    # set it directly, and not via the setter, so as not to
+                    # relocate the fact (which we already know the location of).
+                    self._curr_fact = next_fact
+            # Restore curr_fact, so that the jump callback sees the change.
+            self._curr_fact = from_fact
+            if next_fact is None:
+                return None
+            # We (re)wired the facts to the group earlier; now rewire the group.
+            self.fulfill_jump(next_fact, reason="fact-inc")
+            self.debug("\n- next: {}", lambda: next_fact.short)
+            return next_fact
+
+        # ***
+
+        def step_fact_inc():
             # Check first if we've reached the ending of all time.
             is_final_fact = self.curr_index == (len(self.curr_group) - 1)
             if (
@@ -61,12 +88,9 @@ class FactsManager_FactInc(object):
             #   maybe self.curr_group, but not self.curr_fact (so the state
             #   is outta sorts).
             self.controller.affirm(self.curr_fact.end <= next_fact.start)
-            # We (re)wired the fact to the group earlier; now rewire the group.
-            self.fulfill_jump(next_fact, reason="fact-inc")
             # See if we've identified the boundary of the known factiverse.
             if (next_fact.end is None) or (next_fact.end is UntilTimeStops):
                 self.controller.affirm(self.curr_group.until_time_stops)
-            self.controller.client_logger.debug("\n- next: {}".format(next_fact.short))
             return next_fact
 
         # ***
@@ -147,7 +171,7 @@ class FactsManager_FactInc(object):
             return True
 
         def fetch_next_group():
-            next_group_index = self.groups.index(self.curr_group) + 1
+            next_group_index = self.group_index(self.curr_group) + 1
             if next_group_index < len(self.groups):
                 return self.groups[next_group_index], next_group_index
             return None, None
@@ -166,7 +190,7 @@ class FactsManager_FactInc(object):
             with self.fact_group_rekeyed():
                 # The rekeyed fcn., pops curr_group, so decrement next index.
                 next_group_index -= 1
-                _next_group = self.groups.pop(next_group_index)
+                _next_group = self.pop_group(next_group_index)
                 self.controller.affirm(next_group is _next_group)
                 self.curr_index += 1
                 # Note that addition returns a new object, e.g.,
@@ -245,7 +269,9 @@ class FactsManager_FactInc(object):
         # Search forward from the end time of the group (rather than,
         # say, calling subsequent(self.curr_fact)), so that we skip time
         # that's currently under our control.
-        next_from_store = self.controller.facts.subsequent(
+        # - Note that read_ahead_subsequent stages a window of Facts from the
+        #   store, so that stepping forward does not query once per Fact.
+        next_from_store = self.read_ahead_subsequent(
             fact=ref_fact,
             ref_time=ref_time,
         )
@@ -33,6 +33,7 @@ class FactsManager_Gap(object):
             start=since_time,
             end=until_time,
         )
+        self.gap_fact_pks.add(gap_fact.pk)
         # Add to undo stack. Sorta tricky. Sorta a hack.
         self.on_insert_fact(gap_fact)
         return gap_fact
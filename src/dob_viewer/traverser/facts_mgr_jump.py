@@ -41,14 +41,13 @@ class FactsManager_Jump(object):
     def debug_log_facts_mgr_state(self, caller_name):
         self.debug(
             "{}: len(groups): {} / curr_index: {}\n"
-            "- grps:\n{}\n- cgrp: {}\n- curr: {}".format(
-                caller_name,
-                len(self.groups),
-                self.curr_index,
-                self.debug__str,
-                self.curr_group,
-                self.curr_fact.short,
-            )
+            "- grps:\n{}\n- cgrp: {}\n- curr: {}",
+            caller_name,
+            len(self.groups),
+            self.curr_index,
+            lambda: self.debug__str,
+            lambda: str(self.curr_group),
+            lambda: self.curr_fact.short,
         )
 
     # ***
@@ -236,6 +235,8 @@ class FactsManager_Jump(object):
             group_fact,
             store_fact,
         ):
+            if not self.debug.enabled:
+                return
             self.debug("ref_time: {}".format(ref_time))
             self.debug("near_group: {}".format(fact_group.sorty_times))
             self.debug("nerst_fact: {}".format(nearest_fact and nearest_fact.short))
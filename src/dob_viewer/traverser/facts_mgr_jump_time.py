@@ -54,7 +54,7 @@ class FactsManager_JumpTime(object):
 
     @jump_time_reference.setter
     def jump_time_reference(self, jump_time_reference):
-        self.debug("set: {}".format(jump_time_reference))
+        self.debug("set: {}", jump_time_reference)
         self._jump_time_reference = jump_time_reference
 
     # ***
@@ -0,0 +1,286 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+"""FactsManager_ReadAhead"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+__all__ = ("FactsManager_ReadAhead",)
+
+
+# A staged window of Facts from the store, in the order the store would return
+# them from subsequent (or antecedent): by (start, end, pk), asc (or desc).
+# - The anchor is the since (or until) time used to fetch the window, and
+#   complete is True if the store had fewer Facts than the window size, i.e.,
+#   if there's nothing more beyond the window in that direction.
+StagedFacts = namedtuple("StagedFacts", ("anchor", "facts", "complete"))
+
+
+class FactsManager_ReadAhead(object):
+    """"""
+
+    def __init__(self, *args, **kwargs):
+        super(FactsManager_ReadAhead, self).__init__()
+        self.read_ahead_reset()
+
+    def read_ahead_reset(self):
+        self._staged_next = None
+        self._staged_prev = None
+        self._batch_window = 0
+
+    @property
+    def read_ahead_window(self):
+        window = int(self.controller.config["editor.fact_read_ahead"])
+        if window < 2:
+            # Disabled by the user.
+            return window
+        return max(window, self._batch_window)
+
+    @contextmanager
+    def read_ahead_batch(self, count, forward=True):
+        """Widens the window to fit a multi-fact jump in one range query."""
+        if count < 2:
+            yield
+            return
+        # Forget a staged window that's too narrow to serve the whole batch.
+        staged = self._staged_next if forward else self._staged_prev
+        if staged is not None and not staged.complete and len(staged.facts) < count:
+            if forward:
+                self._staged_next = None
+            else:
+                self._staged_prev = None
+        self._batch_window = count
+        try:
+            yield
+        finally:
+            self._batch_window = 0
+
+    # ***
+
+    # (lb): Rather than ask the store for each fact, one query at a time, as the
+    # user steps through the Carousel, fetch a window of facts with one range
+    # query and serve the following steps from that. The store methods we stand
+    # in for, subsequent and antecedent, are careful about momentaneous Facts,
+    # so we apply the same criteria here, just in Python rather than in SQL.
+
+    def read_ahead_subsequent(self, fact=None, ref_time=None):
+        if fact is not None:
+            if fact.start and isinstance(fact.start, datetime):
+                ref_time = fact.start
+            elif fact.end and isinstance(fact.end, datetime):
+                ref_time = fact.end
+        if self.read_ahead_window < 2 or not isinstance(ref_time, datetime):
+            return self.controller.facts.subsequent(fact=fact, ref_time=ref_time)
+
+        ref_time = read_ahead_seconds(ref_time)
+        ref_pk = fact.pk if fact is not None else None
+
+        def _read_ahead_subsequent():
+            staged = self._staged_next
+            if staged is not None and staged.anchor <= ref_time:
+                found = first_subsequent(staged)
+                if found is not None or staged.complete:
+                    return read_ahead_found(found)
+            staged = self.read_ahead_stage_next(ref_time)
+            found = first_subsequent(staged)
+            if found is not None or staged.complete:
+                return read_ahead_found(found)
+            # Only reachable if more momentaneous Facts share the same moment
+            # than fit in the window; let the store sort it out.
+            return self.controller.facts.subsequent(fact=fact, ref_time=ref_time)
+
+        def first_subsequent(staged):
+            for candidate in staged.facts:
+                if is_subsequent(candidate):
+                    return candidate
+            return None
+
+        def is_subsequent(candidate):
+            if ref_pk is not None and candidate.pk == ref_pk:
+                return False
+            start = read_ahead_seconds(candidate.start)
+            if start > ref_time:
+                return True
+            if start < ref_time or candidate.end is None:
+                return False
+            end = read_ahead_seconds(candidate.end)
+            if end > ref_time:
+                return True
+            return end == ref_time and ref_pk is not None and candidate.pk > ref_pk
+
+        return _read_ahead_subsequent()
+
+    # ***
+
+    def read_ahead_antecedent(self, fact=None, ref_time=None):
+        if fact is not None:
+            if fact.end and isinstance(fact.end, datetime):
+                ref_time = fact.end
+            elif fact.start and isinstance(fact.start, datetime):
+                ref_time = fact.start
+        if self.read_ahead_window < 2 or not isinstance(ref_time, datetime):
+            return self.controller.facts.antecedent(fact=fact, ref_time=ref_time)
+
+        ref_time = read_ahead_seconds(ref_time)
+        ref_pk = fact.pk if fact is not None else None
+
+        def _read_ahead_antecedent():
+            staged = self._staged_prev
+            if staged is not None and staged.anchor >= ref_time:
+                found = first_antecedent(staged)
+                if found is not None or staged.complete:
+                    return read_ahead_found(found)
+            staged = self.read_ahead_stage_prev(ref_time)
+            found = first_antecedent(staged)
+            if found is not None or staged.complete:
+                return read_ahead_found(found)
+            return self.controller.facts.antecedent(fact=fact, ref_time=ref_time)
+
+        def first_antecedent(staged):
+            for candidate in staged.facts:
+                if is_antecedent(candidate):
+                    return candidate
+            return None
+
+        def is_antecedent(candidate):
+            if ref_pk is not None and candidate.pk == ref_pk:
+                return False
+            start = read_ahead_seconds(candidate.start)
+            if candidate.end is None:
+                return start < ref_time
+            end = read_ahead_seconds(candidate.end)
+            if end < ref_time:
+                return True
+            if end > ref_time:
+                return False
+            if start < ref_time:
+                return True
+            return start == ref_time and ref_pk is not None and candidate.pk < ref_pk
+
+        return _read_ahead_antecedent()
+
+    # ***
+
+    def read_ahead_stage_next(self, ref_time):
+        facts = self.controller.facts.get_all(
+            since=ref_time,
+            deleted=False,
+            sort_cols=("start",),
+            sort_orders=("asc",),
+            limit=self.read_ahead_window,
+        )
+        complete = len(facts) < self.read_ahead_window
+        self._staged_next = StagedFacts(ref_time, facts, complete)
+        return self._staged_next
+
+    def read_ahead_stage_prev(self, ref_time):
+        # Note that partial=True with just an until matches any Fact that
+        # starts at or before until, which includes the Active Fact.
+        facts = self.controller.facts.get_all(
+            until=ref_time,
+            partial=True,
+            deleted=False,
+            sort_cols=("start",),
+            sort_orders=("desc",),
+            limit=self.read_ahead_window,
+        )
+        complete = len(facts) < self.read_ahead_window
+        self._staged_prev = StagedFacts(ref_time, facts, complete)
+        return self._staged_prev
+
+    # ***
+
+    def read_ahead_warm(self, forward=True, backward=True):
+        """Restages the window beyond the current group if it's running low."""
+        if self.read_ahead_window < 2 or self.curr_group is None:
+            return
+        if forward:
+            self.read_ahead_warm_next()
+        if backward:
+            self.read_ahead_warm_prev()
+
+    def read_ahead_warm_next(self):
+        ref_time = self.curr_group.time_until
+        if not isinstance(ref_time, datetime):
+            return
+        ref_time = read_ahead_seconds(ref_time)
+        staged = self._staged_next
+        if staged is not None and staged.anchor <= ref_time:
+            if staged.complete:
+                return
+            remaining = sum(
+                1 for fact in staged.facts if read_ahead_seconds(fact.start) >= ref_time
+            )
+            if remaining > self.read_ahead_window // 2:
+                return
+        self.read_ahead_stage_next(ref_time)
+
+    def read_ahead_warm_prev(self):
+        ref_time = self.curr_group.time_since
+        if not isinstance(ref_time, datetime):
+            return
+        ref_time = read_ahead_seconds(ref_time)
+        staged = self._staged_prev
+        if staged is not None and staged.anchor >= ref_time:
+            if staged.complete:
+                return
+            remaining = sum(
+                1 for fact in staged.facts if read_ahead_seconds(fact.start) <= ref_time
+            )
+            if remaining > self.read_ahead_window // 2:
+                return
+        self.read_ahead_stage_prev(ref_time)
+
+    def read_ahead_neighbors(self, forward=True, backward=True):
+        """Returns the Facts one step from the current Fact, as best we know."""
+        neighbors = []
+        if self.curr_group is None:
+            return neighbors
+        # Within the group, the neighbors are known. Beyond the group, look in
+        # the read-ahead window (which read_ahead_warm stages beforehand).
+        # - These are the Facts a step would land on, unless there's a gap,
+        #   or the neighboring group abuts; then it's a wasted effort.
+        peek_store = self.read_ahead_window >= 2
+        if forward:
+            if self.curr_index < (len(self.curr_group) - 1):
+                neighbors.append(self.curr_group[self.curr_index + 1])
+            elif peek_store and not self.curr_group.until_time_stops:
+                neighbors.append(self.fetch_next_from_store())
+        if backward:
+            if self.curr_index > 0:
+                neighbors.append(self.curr_group[self.curr_index - 1])
+            elif peek_store and not self.curr_group.since_time_began:
+                neighbors.append(self.fetch_prev_from_store())
+        return [fact for fact in neighbors if fact is not None]
+
+
+# ***
+
+
+def read_ahead_seconds(dt):
+    # The store compares times at the resolution of seconds.
+    return dt.replace(microsecond=0)
+
+
+def read_ahead_found(found):
+    # The caller is apt to wire (and edit) the fact it gets back, and it might
+    # ask for the same one again (e.g., after a jump elsewhere), so never hand
+    # out the staged instance itself.
+    if found is None:
+        return None
+    return found.copy()
@@ -43,9 +43,7 @@ class FactsManager_Rift(object):
                 add_time_rift(last_group_last_fact)
 
         def add_time_rift(some_fact):
-            self.controller.client_logger.debug(
-                "time_rifts: {}".format(some_fact.start),
-            )
+            self.debug("time_rifts: {}", some_fact.start)
             self.time_rifts.append(some_fact.start)
 
         _place_time_rifts()
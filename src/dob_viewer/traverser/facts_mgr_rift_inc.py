@@ -43,7 +43,7 @@ class FactsManager_RiftInc(object):
             _final_group, final_fact = group_latest(final_group)
             next_fact = final_fact
             # Set Edit/FactsManagers' curr_fact; Clear _jump_time_ref.;
-            # Update viewed_fact_pks; Maybe call reset_paste/reset paste_cnt.
+            # Update unviewed_fact_pks; Maybe call reset_paste/reset paste_cnt.
             self.fulfill_jump(next_fact, reason=reason)
             if include_edge_gap and next_fact.end is not None:
                 # Create the active gap Fact.
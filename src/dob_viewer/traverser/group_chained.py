@@ -32,44 +32,23 @@ __all__ = (
 
 
 def integer_range_groupify(integers):
-    from itertools import groupby
-    from operator import itemgetter
-
-    def _integer_range_groupify():
-        srtd = sorted(map(int, integers))
-        return assemble_groups(srtd)
-
-    def range_key_recursive(srtd, ix):
-        if ix[0] == 0:
-            # Very first item, so always start of group.
-            return ix[1]
-        prev_idx = ix[0] - 1
-        prev_val = int(srtd[prev_idx])
-        if ix[1] == prev_val + 1:
-            # Previous item value is 1 before this one, so walk backwards.
-            return range_key_recursive(
-                srtd,
-                (
-                    prev_idx,
-                    prev_val,
-                ),
-            )
-        return ix[1]
-
-    def range_key(srtd, ix):
-        key = range_key_recursive(srtd, ix)
-        # print('ix:', ix, 'key:', key)
-        return key
-
-    def assemble_groups(srtd):
-        grouped = []
-        for key, grp in groupby(enumerate(srtd), lambda ix: range_key(srtd, ix)):
-            # print('key: {} / grp: {} {}'.format(key, grp, list(grp)))
-            # print(list(map(itemgetter(1), grp)))
-            grouped.append(list(map(itemgetter(1), grp)))
-        return grouped
-
-    return _integer_range_groupify()
+    grouped = []
+    run_key = None
+    prev_val = None
+    for integer in sorted(map(int, integers)):
+        # Each integer is keyed by the value that starts its run of
+        # consecutive integers, and integers with the same key group.
+        if (prev_val is None) or (integer != prev_val + 1):
+            key = integer
+        else:
+            key = run_key
+        if grouped and key == run_key:
+            grouped[-1].append(integer)
+        else:
+            grouped.append([integer])
+        run_key = key
+        prev_val = integer
+    return grouped
 
 
 # ***
@@ -102,6 +81,14 @@ class GroupChained(object):
     # def __init__(self, facts=None):
     def __init__(self, facts=None, affirm=None):
         self.facts = sorted_facts_list(facts)
+        # Lookup by PK, so that index() need not scan the group.
+        self.by_pk = {fact.pk: fact for fact in self.facts}
+        # The key this group was sorted by when it was added to the
+        # FactsManager.groups list (see FactsManager.add_group).
+        self.groups_key = None
+        # Cache of the PK ranges summary that __str__ shows (which the
+        # debug logging calls often), reset whenever membership changes.
+        self._pk_ranges = None
         self.reset_time_window()
         self.affirm = affirm or (lambda _x: None)
 
@@ -116,6 +103,7 @@ class GroupChained(object):
     # ***
 
     def __delitem__(self, key):
+        self.forget_facts(self.facts[key])
         del self.facts[key]
 
     def __getitem__(self, key):
@@ -123,17 +111,21 @@ class GroupChained(object):
 
     # For, e.g., self.group[:] = ...
     def __setitem__(self, key, value):
+        self.forget_facts(self.facts[key])
         del self.facts[key]
+        self._pk_ranges = None
         try:
             # For, e.g., self.group[:] = ...
             # value is a slice().
             for fact in value.facts:
                 self.facts.add(fact)
+                self.by_pk[fact.pk] = fact
             self.claim_fact_time(value.facts)
         except AttributeError:
             # For, e.g., self.group[0] = ...
             # value is a (Placeable)Fact.
             self.facts.add(value)
+            self.by_pk[value.pk] = value
 
     # ***
 
@@ -174,6 +166,11 @@ class GroupChained(object):
                 return "{} to {}".format(lhs, rhs)
 
         def assemble_pk_ranges():
+            if self._pk_ranges is None:
+                self._pk_ranges = _assemble_pk_ranges()
+            return self._pk_ranges
+
+        def _assemble_pk_ranges():
             # 2019-12-03: (lb): Cull Fact(s) with pk == None.
             # - I fixed a bug: I added a tag, and saved. But self.facts here
             # had a fact with pk == None, to wit: str(None) returned 'None',
@@ -257,6 +254,8 @@ class GroupChained(object):
     def add(self, some_fact):
         # Caller Beware: This changes the group key!
         self.facts.add(some_fact)
+        self.by_pk[some_fact.pk] = some_fact
+        self._pk_ranges = None
         self.claim_fact_time([some_fact])
 
     def bisect_key_left(self, key):
@@ -266,10 +265,34 @@ class GroupChained(object):
         return self.facts.bisect_left(value)
 
     def index(self, some_fact):
-        for index, fact in enumerate(self.facts):
-            if some_fact.pk == fact.pk:
+        try:
+            fact = self.by_pk[some_fact.pk]
+        except KeyError:
+            raise ValueError("Fact with PK '{0}' is not in list".format(some_fact.pk))
+        # Find the fact by its times, stepping past any momentaneous
+        # neighbors that share the same times.
+        index = self.facts.bisect_key_left(fact.sorty_times)
+        while index < len(self.facts):
+            if self.facts[index] is fact:
                 return index
+            if self.facts[index].sorty_times != fact.sorty_times:
+                break
+            index += 1
+        # The fact's times were changed in place since it was added, so it's
+        # not where its times say it should be. Callers must re-add a Fact to
+        # change its times (see FactsManager.fact_group_rekeyed), so complain.
         raise ValueError("Fact with PK '{0}' is not in list".format(some_fact.pk))
 
     def pop(self, index):
-        return self.facts.pop(index)
+        fact = self.facts.pop(index)
+        self.forget_facts([fact])
+        return fact
+
+    def forget_facts(self, facts):
+        self._pk_ranges = None
+        if not isinstance(facts, list):
+            facts = [facts]
+        for fact in facts:
+            # Leave be a different fact with the same PK, if one was added.
+            if self.by_pk.get(fact.pk) is fact:
+                del self.by_pk[fact.pk]
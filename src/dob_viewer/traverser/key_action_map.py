@@ -28,13 +28,29 @@ class KeyActionMap(object):
     def __init__(self, carousel):
         self.carousel = carousel
 
-        self.zone_manager = carousel.zone_manager
+    # The ActionManager reuses the key bindings (which are wired to this
+    # object's methods) across Carousel standups, but each standup makes
+    # a new ZoneManager. So look up the zones each time, when called.
 
-        self.zone_content = carousel.zone_manager.zone_content
-        self.zone_details = carousel.zone_manager.zone_details
-        self.zone_lowdown = carousel.zone_manager.zone_lowdown
+    @property
+    def update_handler(self):
+        return self.carousel.update_handler
 
-        self.update_handler = carousel.update_handler
+    @property
+    def zone_manager(self):
+        return self.carousel.zone_manager
+
+    @property
+    def zone_content(self):
+        return self.carousel.zone_manager.zone_content
+
+    @property
+    def zone_details(self):
+        return self.carousel.zone_manager.zone_details
+
+    @property
+    def zone_lowdown(self):
+        return self.carousel.zone_manager.zone_lowdown
 
     # ***
 
@@ -0,0 +1,47 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+"""Debug logging that defers formatting until the message would be emitted."""
+
+import logging
+
+__all__ = ("LazyDebugLogger",)
+
+
+class LazyDebugLogger(object):
+    """
+    A stand-in for logger.debug that skips formatting if DEBUG is not enabled.
+
+    Call it like logger.debug with a preformatted message, or pass a format
+    string and its arguments, and it'll call str.format only if the logger
+    would emit the message. Any argument that's callable (e.g., a lambda) is
+    likewise only called then, which is how callers defer computing the more
+    expensive debug strings, like FactsManager.debug__str.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def __call__(self, message, *args):
+        if not self.enabled:
+            return
+        if args:
+            message = message.format(*[arg() if callable(arg) else arg for arg in args])
+        self.logger.debug(message)
+
+    @property
+    def enabled(self):
+        return self.logger.isEnabledFor(logging.DEBUG)
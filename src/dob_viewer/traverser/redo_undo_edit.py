@@ -17,11 +17,17 @@
 
 """Fact-editing Redo/Undo Manager"""
 
+import sys
 import time
 from collections import namedtuple
 
+from .lazy_logger import LazyDebugLogger
+
 __all__ = (
+    "FactDelta",
     "RedoUndoEdit",
+    "UndoRedoDelta",
+    "UndoRedoStack",
     "UndoRedoTuple",
 )
 
@@ -32,15 +38,201 @@ UndoRedoTuple = namedtuple(
 )
 
 
+# A single field change to one Fact: enough to rebuild the pristine Fact
+# from the altered Fact, without keeping a whole copy of the former around.
+FactDelta = namedtuple("FactDelta", ("pk", "attr", "old", "new"))
+
+# The Fact attributes that an edit might change (and that Fact.copy copies).
+FACT_DELTA_ATTRS = (
+    "activity",
+    "start",
+    "end",
+    "description",
+    "tags",
+    "deleted",
+    "split_from",
+    "dirty_reasons",
+)
+
+
+class UndoRedoDelta(
+    namedtuple("UndoRedoDelta", ("deltas", "pks", "time", "what", "by_pk"))
+):
+    """
+    An UndoRedoTuple look-alike that stores the field-level changes between
+    the pristine and altered Facts, rather than copies of the pristine Facts.
+
+    It also stores just the PKs of the altered Facts, which are looked up in
+    by_pk, which is the FactsManager lookup once the entry is on an undo or
+    redo stack (see UndoRedoStack.append), so that no entry keeps old Facts
+    alive. Undo and redo revert the live Facts in place (see restore_deltas),
+    and the pristine Facts are otherwise rebuilt on demand, from copies of the
+    live Facts.
+    """
+
+    __slots__ = ()
+
+    @property
+    def altered(self):
+        return [self.by_pk[pk] for pk in self.pks]
+
+    @property
+    def pristine(self):
+        return [self.restored(fact) for fact in self.altered]
+
+    def restored(self, fact):
+        # (lb): Copy, rather than revert the live Fact in place, because
+        # the live Fact is wired into the GroupChained (and SortedKeyList).
+        # (To revert the wired Facts, see EditsManager.restore_deltas.)
+        restored = fact.copy()
+        revert_fact_deltas([restored], self.deltas)
+        return restored
+
+    @property
+    def changed(self):
+        # The dirty_reasons are always recorded, so ignore those.
+        return any(delta.attr != "dirty_reasons" for delta in self.deltas)
+
+
+class UndoRedoStack(list):
+    """
+    A list of UndoRedoTuple that forgets its oldest entries once it holds
+    more than max_entries, or more than about max_bytes of Fact copies.
+
+    Callers use it like any list (append, pop, clear, [-1]), and it keeps
+    a running tally of the memory its entries use. If given an UndoJournal,
+    it also journals each change, so the stack can be recovered after a crash.
+    """
+
+    def __init__(
+        self,
+        max_entries=0,
+        max_bytes=0,
+        on_evict=None,
+        name="",
+        journal=None,
+        by_pk=None,
+    ):
+        super(UndoRedoStack, self).__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.name = name
+        self.journal = journal
+        self.by_pk = by_pk
+        self.entry_bytes = []
+        self.nbytes = 0
+        self.entry_journaled = []
+        self.evicted = 0
+
+    def append(self, urt_changes):
+        urt_changes = undo_redo_compacted(urt_changes, self.by_pk)
+        super(UndoRedoStack, self).append(urt_changes)
+        nbytes = undo_redo_tuple_bytes(urt_changes)
+        self.entry_bytes.append(nbytes)
+        self.nbytes += nbytes
+        self.entry_journaled.append(self.journal_push(urt_changes))
+        self.evict_oldest()
+
+    def journal_push(self, urt_changes):
+        # Skip the newest undo until its edit is sealed (and its altered Facts
+        # are set), e.g., add_undoable is followed by update_undo_altered, which
+        # pops it and appends it anew (otherwise there's nothing to recover).
+        if (self.journal is None) or (urt_changes.altered is None):
+            return False
+        self.journal.stack_push(self.name, urt_changes)
+        return True
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += len(self)
+        urt_changes = super(UndoRedoStack, self).pop(index)
+        self.nbytes -= self.entry_bytes.pop(index)
+        if self.entry_journaled.pop(index):
+            # The journaled stack only has the journaled entries.
+            self.journal.stack_pop(self.name, sum(self.entry_journaled[:index]))
+        return urt_changes
+
+    def clear(self):
+        super(UndoRedoStack, self).clear()
+        self.entry_bytes.clear()
+        self.nbytes = 0
+        self.entry_journaled.clear()
+        if self.journal is not None:
+            self.journal.stack_clear(self.name)
+
+    def evict_oldest(self):
+        # Never evict the newest entry, which the caller might still be building
+        # (e.g., add_undoable is followed by update_undo_altered).
+        while len(self) > 1 and self.over_capacity:
+            evicted = self.pop(0)
+            self.evicted += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    @property
+    def over_capacity(self):
+        if self.max_entries and len(self) > self.max_entries:
+            return True
+        if self.max_bytes and self.nbytes > self.max_bytes:
+            return True
+        return False
+
+
+# ***
+
+
 class RedoUndoEdit(object):
     """"""
 
     def __init__(self, edits_manager):
         self.controller = edits_manager.controller
-        self.debug = edits_manager.controller.client_logger.debug
+        self.debug = LazyDebugLogger(edits_manager.controller.client_logger)
         self.edits_manager = edits_manager
-        self.undo = []
-        self.redo = []
+        self.undo = self.create_stack("undo", edits_manager.undo_journal)
+        self.redo = self.create_stack("redo", edits_manager.undo_journal)
+
+    def create_stack(self, name, journal=None):
+        return UndoRedoStack(
+            max_entries=int(self.controller.config["editor.undo_max_entries"]),
+            max_bytes=int(self.controller.config["editor.undo_max_bytes"]),
+            on_evict=self.on_evict,
+            name=name,
+            journal=journal,
+            by_pk=self.edits_manager.conjoined.by_pk,
+        )
+
+    def on_evict(self, urt_changes):
+        self.debug(
+            "evicted: {}: no.: {}", urt_changes.what, undo_redo_tuple_count(urt_changes)
+        )
+
+    # ***
+
+    def memory_usage(self):
+        """Returns the entry counts and approximate byte sizes of the history."""
+        return {
+            "undo_entries": len(self.undo),
+            "undo_bytes": self.undo.nbytes,
+            "undo_evicted": self.undo.evicted,
+            "redo_entries": len(self.redo),
+            "redo_bytes": self.redo.nbytes,
+            "redo_evicted": self.redo.evicted,
+        }
+
+    def log_memory_usage(self):
+        usage = self.memory_usage()
+        self.controller.client_logger.info(
+            "Undo history: {} steps (~{} bytes, {} evicted);"
+            " redo: {} steps (~{} bytes, {} evicted)".format(
+                usage["undo_entries"],
+                usage["undo_bytes"],
+                usage["undo_evicted"],
+                usage["redo_entries"],
+                usage["redo_bytes"],
+                usage["redo_evicted"],
+            )
+        )
 
     # ***
 
@@ -51,30 +243,28 @@ class RedoUndoEdit(object):
         if self.controller.config[
             "dev.catch_errors"
         ]:  # More devmode than catch_errors.
-            facts_shorts = ""
-            if urt_changes.altered:
-                for idx, fact in enumerate(urt_changes.altered):
-                    facts_shorts += "\n- # {:d}.: {}".format(
-                        idx,
-                        fact.short,
-                    )
-            self.controller.client_logger.debug(
-                "{}: no. changes: {} / to: {}{}".format(
-                    whence,
-                    len(urt_changes.pristine),
-                    which is self.undo and "undo" or "redo",
-                    facts_shorts,
-                ),
+
+            def facts_shorts():
+                return "".join(
+                    "\n- # {:d}.: {}".format(idx, fact.short)
+                    for idx, fact in enumerate(urt_changes.altered or [])
+                )
+
+            self.debug(
+                "{}: no. changes: {} / to: {}{}",
+                whence,
+                undo_redo_tuple_count(urt_changes),
+                which is self.undo and "undo" or "redo",
+                facts_shorts,
             )
 
     def clear_changes(self, which, whence=""):
         which.clear()
         if self.controller.config["dev.catch_errors"]:
-            self.controller.client_logger.debug(
-                "{}: cleared changes from: {}".format(
-                    whence,
-                    which is self.undo and "undo" or "redo",
-                ),
+            self.debug(
+                "{}: cleared changes from: {}",
+                whence,
+                which is self.undo and "undo" or "redo",
             )
 
     # ***
@@ -93,16 +283,22 @@ class RedoUndoEdit(object):
     # ***
 
     def undoable_changes(self, what, *edit_facts):
+        # Rather than copy the Facts we're about to edit, remember just their
+        # field values. The caller edits the Facts in place, and then calls
+        # undo_redo_sealed to record the new values and to cull the unchanged.
+        # Until the changes are appended to the undo stack, look up the Facts
+        # being edited, which are copies that are not wired in yet.
         edit_facts = list(filter(None, edit_facts))
-        edit_fact_copies = [
-            edit_fact.copy() for edit_fact in edit_facts if edit_fact is not None
-        ]
-        self.controller.affirm(len(edit_fact_copies) > 0)
-        undoable_changes = UndoRedoTuple(
-            edit_fact_copies,
-            edit_facts,
+        self.controller.affirm(len(edit_facts) > 0)
+        deltas = []
+        for edit_fact in edit_facts:
+            deltas.extend(fact_delta_snapshot(edit_fact))
+        undoable_changes = UndoRedoDelta(
+            tuple(deltas),
+            tuple(edit_fact.pk for edit_fact in edit_facts),
             time.time(),
             what=what,
+            by_pk={edit_fact.pk: edit_fact for edit_fact in edit_facts},
         )
         return undoable_changes
 
@@ -113,7 +309,7 @@ class RedoUndoEdit(object):
         if last_edits.pristine == edit_facts:
             # Nothing changed.
             toss_changes = self.undo.pop()
-            self.debug("pop!: no.: {}".format(len(toss_changes)))
+            self.debug("pop!: no.: {}", len(toss_changes))
             return None
         else:
             # Since what's on the undo is different, the redo is kaput.
@@ -171,7 +367,7 @@ class RedoUndoEdit(object):
     def undo_last_edit(self, restore_facts):
         try:
             undo_changes = self.undo.pop()
-            self.debug("pop!: no.: {}".format(len(undo_changes)))
+            self.debug("pop!: no.: {}", len(undo_changes))
         except IndexError:
             undone = False
         else:
@@ -184,7 +380,7 @@ class RedoUndoEdit(object):
     def redo_last_undo(self, restore_facts):
         try:
             redo_changes = self.redo.pop()
-            self.debug("pop!: no.: {}".format(len(redo_changes)))
+            self.debug("pop!: no.: {}", len(redo_changes))
         except IndexError:
             redone = False
         else:
@@ -194,6 +390,8 @@ class RedoUndoEdit(object):
         return redone
 
     def restore_facts(self, fact_changes, restore_facts):
+        if isinstance(fact_changes, UndoRedoDelta):
+            return self.restore_deltas(fact_changes)
         restore_facts(fact_changes.pristine, fact_changes.altered)
         latest_changes = UndoRedoTuple(
             pristine=fact_changes.altered,
@@ -203,6 +401,17 @@ class RedoUndoEdit(object):
         )
         return latest_changes
 
+    def restore_deltas(self, delta_changes):
+        # Revert the live Facts in place, rather than wiring in reverted copies.
+        self.edits_manager.restore_deltas(
+            delta_changes.deltas,
+            delta_changes.pks,
+        )
+        latest_changes = delta_changes._replace(
+            deltas=fact_deltas_reversed(delta_changes.deltas),
+        )
+        return latest_changes
+
     # ***
 
     # Combine edits into same undo if similar and made within short time
@@ -214,20 +423,199 @@ class RedoUndoEdit(object):
         latest_changes = self.undo_peek()
 
         if latest_changes.what != newest_changes.what:
-            self.debug("!what: no.: {}".format(len(newest_changes.pristine)))
+            self.debug("!what: no.: {}", undo_redo_tuple_count(newest_changes))
             return newest_changes
 
         if (
             time.time() - latest_changes.time
         ) > RedoUndoEdit.DISTINCT_CHANGES_THRESHOLD:
-            self.debug("!time: no.: {}".format(len(newest_changes.pristine)))
+            self.debug("!time: no.: {}", undo_redo_tuple_count(newest_changes))
+            return newest_changes
+
+        latest_pks = set([changed.pk for changed in latest_changes.altered])
+        if latest_pks != set([edit_fact.pk for edit_fact in newest_changes.altered]):
+            self.debug("!pks: no.: {}", undo_redo_tuple_count(newest_changes))
             return newest_changes
 
-        latest_pks = set([changed.pk for changed in latest_changes.pristine])
-        if latest_pks != set([edit_fact.pk for edit_fact in newest_changes.pristine]):
-            self.debug("!pks: no.: {}".format(len(newest_changes.pristine)))
+        if not isinstance(latest_changes, UndoRedoDelta):
+            self.debug("!delta: no.: {}", undo_redo_tuple_count(newest_changes))
             return newest_changes
 
         latest_undo = self.undo.pop()
-        self.debug("pop!: no.: {}".format(len(latest_undo.pristine)))
-        return latest_undo
+        self.debug("pop!: no.: {}", undo_redo_tuple_count(latest_undo))
+        return undo_redo_merged(latest_undo, newest_changes)
+
+
+# ***
+
+
+# A rough per-Fact tally for the parts every Fact has: the object, its
+# attribute dict, the datetimes, and the Activity and Category objects.
+FACT_OVERHEAD_BYTES = 1024
+
+# And the same for each Tag object.
+TAG_OVERHEAD_BYTES = 256
+
+
+def approx_fact_bytes(fact):
+    nbytes = FACT_OVERHEAD_BYTES
+    nbytes += sys.getsizeof(fact.description or "")
+    for tag in fact.tags:
+        nbytes += TAG_OVERHEAD_BYTES + sys.getsizeof(tag.name)
+    return nbytes
+
+
+def approx_delta_bytes(delta):
+    nbytes = sys.getsizeof(delta)
+    if delta.attr == "description":
+        nbytes += sys.getsizeof(delta.old or "") + sys.getsizeof(delta.new or "")
+    elif delta.attr == "tags":
+        nbytes += TAG_OVERHEAD_BYTES * (len(delta.old) + len(delta.new))
+    return nbytes
+
+
+def undo_redo_tuple_bytes(urt_changes):
+    # (lb): The altered Facts are often the live Facts (that the Carousel
+    # references anyway), but count them all; this is only an approximation.
+    # (An UndoRedoDelta only references the live Facts, by PK.)
+    if isinstance(urt_changes, UndoRedoDelta):
+        nbytes = sys.getsizeof(urt_changes.pks)
+        for delta in urt_changes.deltas:
+            nbytes += approx_delta_bytes(delta)
+        return nbytes
+    nbytes = 0
+    for facts in (urt_changes.pristine, urt_changes.altered):
+        for fact in facts or []:
+            nbytes += approx_fact_bytes(fact)
+    return nbytes
+
+
+def undo_redo_tuple_count(urt_changes):
+    # Avoid UndoRedoDelta.pristine, which makes copies.
+    if isinstance(urt_changes, UndoRedoDelta):
+        return len(urt_changes.pks)
+    return len(urt_changes.pristine)
+
+
+# ***
+
+
+def fact_delta_value(attr, value):
+    # Fact.copy makes its own copies of these mutables; do the same,
+    # so that neither side of a FactDelta is shared with a live Fact.
+    if attr == "tags":
+        return list(value)
+    if attr == "dirty_reasons":
+        return set(value)
+    return value
+
+
+def fact_delta_snapshot(fact):
+    # The new values are not known yet; see undo_redo_sealed.
+    return [
+        FactDelta(fact.pk, attr, fact_delta_value(attr, getattr(fact, attr)), None)
+        for attr in FACT_DELTA_ATTRS
+    ]
+
+
+def fact_delta_changed(delta, new_value):
+    # (lb): Always keep the dirty_reasons, a small set that
+    # other code might update in place after the edit is sealed.
+    return (delta.old != new_value) or (delta.attr == "dirty_reasons")
+
+
+def fact_deltas_reversed(deltas):
+    return tuple(
+        FactDelta(delta.pk, delta.attr, delta.new, delta.old) for delta in deltas
+    )
+
+
+def revert_fact_deltas(facts, deltas):
+    """Sets each Fact's fields back to the old values of its FactDelta."""
+    facts_by_pk = {fact.pk: fact for fact in facts}
+    for delta in deltas:
+        try:
+            fact = facts_by_pk[delta.pk]
+        except KeyError:
+            continue
+        setattr(fact, delta.attr, fact_delta_value(delta.attr, delta.old))
+
+
+# ***
+
+
+def undo_redo_compacted(urt_changes, by_pk=None):
+    """Returns an UndoRedoDelta for a sealed UndoRedoTuple, if possible.
+
+    Only entries whose pristine Facts are copies of the altered Facts' originals
+    can be rebuilt from deltas; all other entries are returned as is, e.g., the
+    newest undo entry, whose altered Facts are not set until the edit completes.
+
+    If given by_pk, the UndoRedoDelta looks up its Facts therein (otherwise it
+    keeps a lookup of the altered Facts).
+    """
+    if isinstance(urt_changes, UndoRedoDelta):
+        if by_pk is None:
+            return urt_changes
+        return urt_changes._replace(by_pk=by_pk)
+    if not isinstance(urt_changes, UndoRedoTuple):
+        return urt_changes
+    pristine, altered = urt_changes.pristine, urt_changes.altered
+    if altered is None or len(pristine) != len(altered):
+        return urt_changes
+    deltas = []
+    for was, new in zip(pristine, altered):
+        if (
+            (was is new)
+            or (was.pk != new.pk)
+            or (was.orig_fact is not (new.orig_fact or new))
+        ):
+            return urt_changes
+        for delta in fact_delta_snapshot(was):
+            new_value = getattr(new, delta.attr)
+            if fact_delta_changed(delta, new_value):
+                deltas.append(
+                    delta._replace(new=fact_delta_value(delta.attr, new_value))
+                )
+    if by_pk is None:
+        by_pk = {fact.pk: fact for fact in altered}
+    return UndoRedoDelta(
+        tuple(deltas),
+        tuple(fact.pk for fact in altered),
+        urt_changes.time,
+        urt_changes.what,
+        by_pk,
+    )
+
+
+def undo_redo_sealed(urt_delta):
+    """Returns the UndoRedoDelta with the new values of its (since edited)
+    altered Facts, less the fields whose values did not change."""
+    facts_by_pk = {fact.pk: fact for fact in urt_delta.altered}
+    deltas = []
+    for delta in urt_delta.deltas:
+        new_value = getattr(facts_by_pk[delta.pk], delta.attr)
+        if fact_delta_changed(delta, new_value):
+            deltas.append(delta._replace(new=fact_delta_value(delta.attr, new_value)))
+    return urt_delta._replace(deltas=tuple(deltas))
+
+
+def undo_redo_merged(older, newer):
+    """Squashes two sealed UndoRedoDelta of the same Facts into one.
+
+    Each field keeps its oldest old value and its newest new value, and fields
+    that ended up where they started are dropped, e.g., if the user nudges the
+    start time ahead and then back again, the merged undo has no time deltas.
+    """
+    olds = {}
+    news = {}
+    for delta in older.deltas + newer.deltas:
+        key = (delta.pk, delta.attr)
+        olds.setdefault(key, delta.old)
+        news[key] = delta.new
+    deltas = []
+    for (pk, attr), old_value in olds.items():
+        delta = FactDelta(pk, attr, old_value, news[(pk, attr)])
+        if fact_delta_changed(delta, delta.new):
+            deltas.append(delta)
+    return UndoRedoDelta(tuple(deltas), newer.pks, older.time, older.what, newer.by_pk)
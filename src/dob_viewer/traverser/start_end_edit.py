@@ -19,7 +19,7 @@
 
 from datetime import timedelta
 
-from .redo_undo_edit import UndoRedoTuple
+from .redo_undo_edit import revert_fact_deltas, undo_redo_sealed
 
 __all__ = ("StartEndEdit",)
 
@@ -30,6 +30,7 @@ class StartEndEdit(object):
     def __init__(self, edits_manager):
         self.edits_manager = edits_manager
         self.controller = edits_manager.controller
+        self.debug = edits_manager.debug
         # MAYBE/2019-01-31: (lb): This class is tightly coupled.
         #  We might as well concede defeat and make this class a
         #  part of an EditsManager hierarchy (like the FactsManager
@@ -83,8 +84,8 @@ class StartEndEdit(object):
             except AttributeError:
                 context = start_or_end
             edit_what = "adjust-time-{}".format(context)
-            # Get an UndoRedoTuple from a copy of the Facts we're about to edit.
-            # And set UndoRedoTuple.altered to the new copies.
+            # Get an UndoRedoDelta that remembers the field values of the Facts
+            # we're about to edit (but not their new values, not until sealed).
             newest_changes = self.redo_undo.undoable_changes(
                 edit_what,
                 edit_fact,
@@ -153,19 +154,7 @@ class StartEndEdit(object):
             # (update the edits_manager.edit_facts and facts_manager.by_pk lookups,
             # and update the facts_manager fact-groups).
 
-            # If same Facts edited with same tool within DISTINCT_CHANGES_THRESHOLD
-            # time, pop the previous undo.
-            last_undo_or_newest_changes = (
-                self.redo_undo.remove_undo_if_same_facts_edited(
-                    newest_changes,
-                )
-            )
-            self.controller.affirm(
-                (newest_changes is last_undo_or_newest_changes)
-                or (newest_changes.pristine == last_undo_or_newest_changes.altered)
-            )
-
-            if newest_changes.pristine == last_undo_or_newest_changes.altered:
+            if not undo_redo_sealed(newest_changes).changed:
                 # Nothing changed! We're done here. E.g., given a completed Fact
                 # that is exactly 30 minutes long, if you typed '+30<TAB>' to set
                 # end to 30 minutes after start, if we kept going, the fact would
@@ -173,48 +162,54 @@ class StartEndEdit(object):
                 # Then user tries to quit, and dob says they have unsaved work.
                 return
 
+            # The Facts currently wired in the FactsManager, which the edited
+            # Facts (copies) replace. These are either the pristine Facts, or
+            # they were altered by the previous undo (that we might be replacing
+            # if within DISTINCT_CHANGES_THRESHOLD).
+            wired_facts = [
+                self.edits_manager.conjoined.by_pk[edit_fact.pk]
+                for edit_fact in newest_changes.altered
+            ]
+
             # Mark things dirty (or not).
             self.edits_manager.manage_edited_dirty_flags(newest_changes.altered)
+            newest_changes = undo_redo_sealed(newest_changes)
 
-            # Create the freshest undo. It might be squished with an earlier
-            # undo created by the user within DISTINCT_CHANGES_THRESHOLD ago,
-            # in which case, the pristine Facts are from the previous undo.
-            # In all cases, the altered Facts are the ones we just edited.
-            undoable = UndoRedoTuple(
-                last_undo_or_newest_changes.pristine,
-                newest_changes.altered,
-                last_undo_or_newest_changes.time,
-                last_undo_or_newest_changes.what,
-            )
-
-            # In lieu of having called add_undoable, add the changes to the undo stack.
-            self.redo_undo.append_changes(
-                self.redo_undo.undo,
-                undoable,
-                whence="edit_time_adjust",
-            )
+            # If same Facts edited with same tool within DISTINCT_CHANGES_THRESHOLD
+            # time, pop the previous undo, and squish it with the new edits. The
+            # old values are from the previous undo, and the new values are from
+            # the Facts we just edited.
+            undoable = self.redo_undo.remove_undo_if_same_facts_edited(newest_changes)
+
+            if undoable.changed:
+                # In lieu of having called add_undoable, add the changes to the
+                # undo stack.
+                self.redo_undo.append_changes(
+                    self.redo_undo.undo,
+                    undoable,
+                    whence="edit_time_adjust",
+                )
+            else:
+                # The user nudged the time back to where it started, so restore
+                # the dirty flags, too, and forget the (now empty) undo.
+                revert_fact_deltas(newest_changes.altered, undoable.deltas)
             # This invalidates the redo stack.
             self.redo_undo.clear_changes(self.redo_undo.redo, "edit_time_adjust")
 
-            self.restore_facts(
-                newest_changes.altered,
-                # This is a little tricky: the Facts currently wired in the
-                # FactsManager were altered by the previous Undo that we might
-                # be replacing if within DISTINCT_CHANGES_THRESHOLD, so use
-                # these Facts to fix the wiring.
-                newest_changes.pristine,
-            )
+            self.restore_facts(newest_changes.altered, wired_facts)
 
         # ***
 
         def debug_log_facts(prefix, edit_fact, edit_prev, edit_next):
-            self.controller.client_logger.debug(
-                "{}\n- edit: {}\n- prev: {}\n- next: {}".format(
-                    prefix,
-                    edit_fact and edit_fact.short or "<no such fact>",
-                    edit_prev and edit_prev.short or "<no such fact>",
-                    edit_next and edit_next.short or "<no such fact>",
-                ),
+            def short(some_fact):
+                return lambda: some_fact and some_fact.short or "<no such fact>"
+
+            self.debug(
+                "{}\n- edit: {}\n- prev: {}\n- next: {}",
+                prefix,
+                short(edit_fact),
+                short(edit_prev),
+                short(edit_next),
             )
 
         # ***
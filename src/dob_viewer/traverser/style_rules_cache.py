@@ -0,0 +1,182 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Memoized StyleEngine rules results, per Fact and per stylable component."""
+
+from prompt_toolkit.layout.containers import Container
+from prompt_toolkit.widgets.base import Label, TextArea
+
+__all__ = (
+    "StyleRulesCache",
+    "fact_fingerprint",
+)
+
+
+class StyleRulesCache(object):
+    """
+    Caches the classes the user's rules.conf assigns each stylable component,
+    by the Fact's matchable fields, so that the rules are not re-evaluated
+    for every widget on every refresh.
+    """
+
+    # Entries are keyed by fact_fingerprint, so an edited Fact never hits a
+    # stale result, but the old entries linger. Start over if they pile up.
+    MAX_ENTRIES = 4096
+
+    def __init__(self, style_engine, affirm):
+        self.style_engine = style_engine
+        self.affirm = affirm
+        self.results = {}
+        # Whether any rule for each component runs user 'eval' code.
+        self.evals_by_name = {}
+        # A Label for the engine to style, to see which classes it'd leave on
+        # a Label with (style, text) tuples (see apply_rules_classes_label).
+        self.scratch_label = None
+
+    def reset(self):
+        self.results = {}
+
+    # ***
+
+    def process_style_rules(self, ppt_widget, friendly_name, fact):
+        custom_classes, final_classes = self.rules_classes(friendly_name, fact)
+        if custom_classes:
+            self.apply_rules_classes(
+                ppt_widget, friendly_name, custom_classes, final_classes
+            )
+        return custom_classes
+
+    def rules_classes(self, friendly_name, fact):
+        if not self.cacheable(friendly_name, fact):
+            return self.evaluate_rules(friendly_name, fact)
+        cache_key = (fact_fingerprint(fact), friendly_name)
+        try:
+            return self.results[cache_key]
+        except KeyError:
+            pass
+        if len(self.results) >= StyleRulesCache.MAX_ENTRIES:
+            self.reset()
+        classes = self.evaluate_rules(friendly_name, fact)
+        self.results[cache_key] = classes
+        return classes
+
+    def cacheable(self, friendly_name, fact):
+        # The fingerprint does not capture everything an 'eval' rule might
+        # check, e.g., the clock, or fact.delta() on an open Fact, which
+        # changes with the clock, so skip the cache in either case.
+        if (fact is not None) and (fact.end is None):
+            return False
+        return not self.component_has_eval_rules(friendly_name)
+
+    def component_has_eval_rules(self, friendly_name):
+        try:
+            return self.evals_by_name[friendly_name]
+        except KeyError:
+            pass
+        # Mirror StyleEngine's choice of rulesets for the component.
+        has_eval = any(
+            ruleset[friendly_name]
+            and not ruleset["disabled"]
+            and ruleset["__eval__"] is not None
+            for ruleset in self.style_engine.rulesets.values()
+        )
+        self.evals_by_name[friendly_name] = has_eval
+        return has_eval
+
+    def evaluate_rules(self, friendly_name, fact):
+        if friendly_name.endswith("-line"):
+            # With no widget, the engine only evaluates the rules and returns
+            # the accumulated classes, which we'll apply ourselves.
+            custom_classes = self.style_engine.process_style_rules(
+                None, friendly_name, fact
+            )
+            return custom_classes, custom_classes
+        # Otherwise, let the engine style a Label with tuples, which it
+        # restyles once per matching rule, so that we know which classes
+        # the final rule leaves behind.
+        if self.scratch_label is None:
+            self.scratch_label = Label(text="")
+        self.scratch_label.text = [("", "")]
+        custom_classes = self.style_engine.process_style_rules(
+            self.scratch_label, friendly_name, fact
+        )
+        final_classes = self.scratch_label.text[0][0]
+        return custom_classes, final_classes
+
+    # ***
+
+    def apply_rules_classes(
+        self, ppt_widget, friendly_name, custom_classes, final_classes
+    ):
+        # (lb): This mirrors StyleEngine.apply_style_rule_class, but applies
+        # all the matching rules' classes at once.
+        if ppt_widget is None:
+            # Style being used in a (style, text, handler) tuple.
+            pass
+        elif isinstance(ppt_widget, Label):
+            self.apply_rules_classes_label(
+                ppt_widget, friendly_name, custom_classes, final_classes
+            )
+        elif isinstance(ppt_widget, Container):
+            ppt_widget.style += custom_classes
+        elif isinstance(ppt_widget, TextArea):
+            ppt_widget.window.style += custom_classes
+        else:
+            # Unexpected path. Unhandled PPT type.
+            self.affirm(False)
+
+    def apply_rules_classes_label(
+        self, label, friendly_name, custom_classes, final_classes
+    ):
+        # The "-line" suffix styles the whole line, via the label window.
+        if friendly_name.endswith("-line"):
+            label.window.style += custom_classes
+        # If label.text is tuples, their style beats formatted_text_control,
+        # so rebuild the tuples list if present.
+        elif (
+            (isinstance(label.text, list))
+            and (len(label.text) > 0)
+            and (isinstance(label.text[0], tuple))
+            and (len(label.text[0]) > 1)
+        ):
+            # (lb): Rules replace, not append, widget's style. #rule_replace
+            # - The engine rebuilds the tuples once per matching rule,
+            #   so only the final rule's classes stick.
+            label.text = [(final_classes, tup[1], *tup[2:]) for tup in label.text]
+        else:
+            label.formatted_text_control.style += custom_classes
+
+
+# ***
+
+
+def fact_fingerprint(fact):
+    """Returns a hashable snapshot of the Fact fields that get rendered and
+    that style rules match against."""
+    if fact is None:
+        return None
+    return (
+        fact.pk,
+        fact.start,
+        fact.end,
+        fact.activity_name,
+        fact.category_name,
+        tuple(sorted(tag.name for tag in fact.tags)),
+        fact.description,
+        fact.deleted,
+        tuple(sorted(fact.dirty_reasons)),
+    )
@@ -0,0 +1,539 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Append-only journal of unsaved edits and undo history, for crash recovery."""
+
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from dob_bright.crud.fact_dressed import FactDressed
+from nark.items.activity import Activity
+from nark.items.category import Category
+from nark.items.tag import Tag
+
+from .redo_undo_edit import FactDelta, UndoRedoDelta, UndoRedoTuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # (lb): E.g., on Windows. Journal without locking.
+    fcntl = None
+
+__all__ = (
+    "JournalReplay",
+    "UndoJournal",
+    "create_undo_journal",
+    "journal_session",
+    "replay_undo_journal",
+)
+
+
+# The journal lives beside the dob data store, e.g., ~/.local/share/dob/,
+# and is named for the editing session (see journal_session), so that
+# sessions that edit different Facts never share (or truncate) a journal.
+JOURNAL_FILENAME = "dob-viewer-{}.journal"
+
+# Regardless of how few records were written, fsync at least this often.
+JOURNAL_SYNC_SECS = 1.0
+
+# Rewrite the journal with just its live records once it holds this many
+# records, and more than twice as many records as are live (see compact).
+JOURNAL_COMPACT_RECORDS = 1024
+
+
+JournalReplay = namedtuple(
+    "JournalReplay",
+    ("session", "edit_facts", "undo", "redo"),
+)
+
+
+def create_undo_journal(controller, facts):
+    """Returns an UndoJournal beside the SQLite data store, or None if disabled."""
+    if not controller.config["editor.undo_journal"]:
+        return None
+    if controller.config["db.engine"] != "sqlite":
+        return None
+    db_path = controller.config["db.path"]
+    if not db_path or db_path == ":memory:":
+        return None
+    session = journal_session(facts)
+    return UndoJournal(
+        os.path.join(
+            os.path.dirname(os.path.abspath(db_path)),
+            JOURNAL_FILENAME.format(session[:16]),
+        ),
+        session=session,
+        sync_every=int(controller.config["editor.undo_journal_sync_every"]),
+    )
+
+
+def journal_session(facts):
+    """Returns an identity for the editing session, from the Facts it starts with.
+
+    E.g., the same import file yields the same session each time, but import
+    PKs are only unique to an import, so a journal is only replayed into a
+    session with the same identity.
+    """
+    session = hashlib.sha1()
+    for fact in facts:
+        session.update(
+            "{}|{}\n".format(fact.pk, fact.start and fact.start.isoformat()).encode()
+        )
+    return session.hexdigest()
+
+
+# ***
+
+
+class UndoJournal(object):
+    """
+    An append-only file of edit and undo/redo stack operations.
+
+    Each line is one JSON record, and each record describes just the Facts
+    it changes, so that replay runs in O(changes), not O(Facts). Records are
+    fsync'ed in batches, so the journal might lose the last few edits in
+    a crash, but it'll never hold a partial, unreadable edit.
+
+    The journal file is created on the first record, and it's locked while
+    open, so that two sessions editing the same Facts do not both write it.
+    """
+
+    def __init__(self, path, session="", sync_every=32):
+        self.path = path
+        self.session = session
+        self.sync_every = sync_every
+        self.journal = None
+        self.locked_out = False
+        self.pending = 0
+        self.synced_at = 0
+        self.reset_records()
+
+    def reset_records(self):
+        # The records that replay would still use, by op (see compact).
+        self.orig_records = {}
+        self.edit_records = {}
+        self.stack_records = {"undo": [], "redo": []}
+        self.written = 0
+
+    # ***
+
+    def replay(self):
+        """Returns the JournalReplay left behind by a crashed session, or None."""
+        if not os.path.exists(self.path) or not self.acquire():
+            return None
+        replayed = replay_undo_journal(self.path)
+        if replayed.session != self.session:
+            return None
+        if not (replayed.edit_facts or replayed.undo or replayed.redo):
+            return None
+        return replayed
+
+    def acquire(self):
+        """Opens and locks the journal, unless another session has it locked."""
+        if self.journal is not None:
+            return True
+        if self.locked_out:
+            return False
+        journal = open(self.path, "a+", encoding="utf8")
+        if not lock_journal(journal):
+            journal.close()
+            # Leave the other session's journal be, and journal nothing.
+            self.locked_out = True
+            return False
+        self.journal = journal
+        return True
+
+    def restart(self):
+        """Truncates the journal and readies it for a new editing session."""
+        if not self.acquire():
+            return
+        self.journal.seek(0)
+        self.journal.truncate()
+        self.reset_records()
+        self.write_header(self.journal)
+        self.sync()
+
+    def write_header(self, journal):
+        journal.write(json.dumps({"op": "session", "session": self.session}))
+        journal.write("\n")
+
+    def close(self, discard=False):
+        if self.journal is not None:
+            self.sync()
+            # Remove the file before releasing the lock, lest we remove
+            # the journal that another session just opened anew.
+            if discard and os.path.exists(self.path):
+                os.remove(self.path)
+            self.journal.close()
+            self.journal = None
+        if discard:
+            self.reset_records()
+
+    def sync(self):
+        if self.journal is None:
+            return
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.pending = 0
+        self.synced_at = time.time()
+
+    # ***
+
+    def compact(self):
+        """Rewrites the journal with just the records that replay would use.
+
+        The journal is append-only, so it grows with every edit, even as most
+        records are superseded (e.g., each edit of the same Fact supersedes the
+        last), popped, or evicted from the undo history. Compacting keeps the
+        journal proportional to the unsaved edits and the undo history size.
+        """
+        records = (
+            list(self.orig_records.values())
+            + list(self.edit_records.values())
+            + self.stack_records["undo"]
+            + self.stack_records["redo"]
+        )
+        # Write the compacted journal beside the old one, and lock it before
+        # replacing the old one, so that the journal is never unlocked (nor,
+        # in the event of a crash, ever partially written).
+        compact_path = "{}.compact".format(self.path)
+        journal = open(compact_path, "w", encoding="utf8")
+        if not lock_journal(journal):  # pragma: no cover
+            journal.close()
+            return
+        self.write_header(journal)
+        for record in records:
+            journal.write(json.dumps(record) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+        os.replace(compact_path, self.path)
+        self.journal.close()
+        self.journal = journal
+        self.written = len(records)
+        self.pending = 0
+        self.synced_at = time.time()
+
+    def compact_maybe(self):
+        if self.written < JOURNAL_COMPACT_RECORDS:
+            return
+        live_count = (
+            len(self.orig_records)
+            + len(self.edit_records)
+            + len(self.stack_records["undo"])
+            + len(self.stack_records["redo"])
+        )
+        if self.written > (2 * live_count):
+            self.compact()
+
+    # ***
+
+    def record(self, op, **kwargs):
+        if self.journal is None:
+            self.restart()
+            if self.journal is None:
+                return None
+        kwargs["op"] = op
+        self.journal.write(json.dumps(kwargs) + "\n")
+        self.written += 1
+        self.pending += 1
+        if (self.pending >= self.sync_every) or (
+            (time.time() - self.synced_at) >= JOURNAL_SYNC_SECS
+        ):
+            self.sync()
+        return kwargs
+
+    # ***
+
+    def edited_fact(self, edit_fact):
+        self.journal_orig(edit_fact)
+        record = self.record("edit", fact=fact_record(edit_fact))
+        if record is not None:
+            self.edit_records[edit_fact.pk] = record
+            self.compact_maybe()
+
+    def forgot_fact(self, pk):
+        if self.record("forget", pk=pk) is not None:
+            self.edit_records.pop(pk, None)
+            self.compact_maybe()
+
+    def stack_push(self, stack, urt_changes):
+        for fact in urt_changes.altered:
+            self.journal_orig(fact)
+        if isinstance(urt_changes, UndoRedoDelta):
+            # Just the changed fields, and the PKs of the Facts they change.
+            record = self.record(
+                "push",
+                stack=stack,
+                deltas=[delta_record(delta) for delta in urt_changes.deltas],
+                pks=list(urt_changes.pks),
+                time=urt_changes.time,
+                what=urt_changes.what,
+            )
+        else:
+            for fact in urt_changes.pristine:
+                self.journal_orig(fact)
+            record = self.record(
+                "push",
+                stack=stack,
+                pristine=[fact_record(fact) for fact in urt_changes.pristine],
+                altered=[fact_record(fact) for fact in urt_changes.altered],
+                time=urt_changes.time,
+                what=urt_changes.what,
+            )
+        if record is not None:
+            self.stack_records[stack].append(record)
+            self.compact_maybe()
+
+    def stack_pop(self, stack, index):
+        if self.record("pop", stack=stack, index=index) is not None:
+            self.stack_records[stack].pop(index)
+            self.compact_maybe()
+
+    def stack_clear(self, stack):
+        if self.record("clear", stack=stack) is not None:
+            self.stack_records[stack].clear()
+            self.compact_maybe()
+
+    def journal_orig(self, fact):
+        # Each Fact's original is written but once, and shared on replay.
+        if not fact.orig_fact or fact.pk in self.orig_records:
+            return
+        record = self.record("orig", fact=fact_record(fact.orig_fact))
+        if record is not None:
+            self.orig_records[fact.pk] = record
+
+
+# ***
+
+
+def replay_undo_journal(path):
+    """Reads the journal at path and returns its JournalReplay."""
+
+    def _replay_undo_journal():
+        sessions = []
+        orig_records = {}
+        edit_records = {}
+        stacks = {"undo": [], "redo": []}
+        for record in read_records():
+            if record["op"] == "session":
+                sessions.append(record["session"])
+                continue
+            replay_record(record, orig_records, edit_records, stacks)
+        origs = {}
+        edit_facts = {
+            pk: fact_from_record(fact_rec, orig_records, origs)
+            for pk, fact_rec in edit_records.items()
+        }
+        return JournalReplay(
+            # The session header, which is always the first record.
+            session=sessions and sessions[0] or None,
+            edit_facts=edit_facts,
+            undo=urts_from_records(stacks["undo"], orig_records, origs, edit_facts),
+            redo=urts_from_records(stacks["redo"], orig_records, origs, edit_facts),
+        )
+
+    def read_records():
+        with open(path, "r", encoding="utf8") as journal:
+            for line in journal:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn write, from a crash mid-record. Nothing follows it.
+                    return
+
+    def replay_record(record, orig_records, edit_records, stacks):
+        op = record["op"]
+        if op == "orig":
+            orig_records[record["fact"]["pk"]] = record["fact"]
+        elif op == "edit":
+            edit_records[record["fact"]["pk"]] = record["fact"]
+        elif op == "forget":
+            edit_records.pop(record["pk"], None)
+        elif op == "push":
+            stacks[record["stack"]].append(record)
+        elif op == "pop":
+            stack = stacks[record["stack"]]
+            if stack:
+                stack.pop(record["index"])
+        elif op == "clear":
+            stacks[record["stack"]].clear()
+
+    def urts_from_records(records, orig_records, origs, edit_facts):
+        urts = []
+        for record in records:
+            if "deltas" in record:
+                urt_changes = urt_delta_from_record(
+                    record, orig_records, origs, edit_facts
+                )
+            else:
+                urt_changes = urt_from_record(record, orig_records, origs)
+            if urt_changes is not None:
+                urts.append(urt_changes)
+        return urts
+
+    def urt_from_record(record, orig_records, origs):
+        return UndoRedoTuple(
+            [fact_from_record(rec, orig_records, origs) for rec in record["pristine"]],
+            [fact_from_record(rec, orig_records, origs) for rec in record["altered"]],
+            record["time"],
+            record["what"],
+        )
+
+    def urt_delta_from_record(record, orig_records, origs, edit_facts):
+        # The deltas are applied to the live Facts (see restore_deltas), so
+        # the entry only needs the PKs; the latest edits serve until the entry
+        # is appended to an UndoRedoStack, which looks up the live Facts.
+        by_pk = {}
+        for pk in record["pks"]:
+            try:
+                by_pk[pk] = edit_facts[pk]
+            except KeyError:
+                if pk not in orig_records:
+                    return None
+                by_pk[pk] = orig_from_records(pk, orig_records, origs)
+        return UndoRedoDelta(
+            tuple(delta_from_record(rec) for rec in record["deltas"]),
+            tuple(record["pks"]),
+            record["time"],
+            record["what"],
+            by_pk,
+        )
+
+    return _replay_undo_journal()
+
+
+# ***
+
+
+def lock_journal(journal):
+    if fcntl is None:  # pragma: no cover
+        return True
+    try:
+        fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+# ***
+
+
+def fact_record(fact):
+    return {
+        "pk": fact.pk,
+        "activity": fact.activity and fact.activity_name,
+        "category": fact.category_name,
+        "start": fact.start and fact.start.isoformat(),
+        "end": fact.end and fact.end.isoformat(),
+        "description": fact.description,
+        "tags": [tag.name for tag in fact.tags],
+        "deleted": fact.deleted,
+        "split_from": getattr(fact.split_from, "pk", fact.split_from),
+        "dirty_reasons": sorted(fact.dirty_reasons),
+        "orig": bool(fact.orig_fact),
+    }
+
+
+def delta_record(delta):
+    return [
+        delta.pk,
+        delta.attr,
+        delta_value_record(delta.attr, delta.old),
+        delta_value_record(delta.attr, delta.new),
+    ]
+
+
+def delta_value_record(attr, value):
+    if value is None:
+        return None
+    if attr == "activity":
+        return [value.name, value.category and value.category.name]
+    if attr in ("start", "end"):
+        return value.isoformat()
+    if attr == "tags":
+        return [tag.name for tag in value]
+    if attr == "split_from":
+        return getattr(value, "pk", value)
+    if attr == "dirty_reasons":
+        return sorted(value)
+    return value
+
+
+def delta_from_record(record):
+    pk, attr, old, new = record
+    return FactDelta(
+        pk,
+        attr,
+        delta_value_from_record(attr, old),
+        delta_value_from_record(attr, new),
+    )
+
+
+def delta_value_from_record(attr, record):
+    if record is None:
+        return None
+    if attr == "activity":
+        name, category = record
+        return Activity(name, category=category and Category(category) or None)
+    if attr in ("start", "end"):
+        return datetime.fromisoformat(record)
+    if attr == "tags":
+        return [Tag(name) for name in record]
+    if attr == "dirty_reasons":
+        return set(record)
+    return record
+
+
+def fact_from_record(record, orig_records, origs):
+    fact = new_fact_from_record(record)
+    if record["orig"]:
+        fact.orig_fact = orig_from_records(record["pk"], orig_records, origs)
+    else:
+        fact.orig_fact = 0
+    return fact
+
+
+def orig_from_records(pk, orig_records, origs):
+    try:
+        return origs[pk]
+    except KeyError:
+        orig_fact = new_fact_from_record(orig_records[pk])
+        orig_fact.orig_fact = 0
+        origs[pk] = orig_fact
+        return orig_fact
+
+
+def new_fact_from_record(record):
+    activity = None
+    if record["activity"] is not None:
+        category = record["category"] and Category(record["category"]) or None
+        activity = Activity(record["activity"], category=category)
+    return FactDressed(
+        activity=activity,
+        start=record["start"] and datetime.fromisoformat(record["start"]),
+        end=record["end"] and datetime.fromisoformat(record["end"]),
+        pk=record["pk"],
+        description=record["description"],
+        tags=[Tag(name) for name in record["tags"]],
+        deleted=record["deleted"],
+        split_from=record["split_from"],
+        dirty_reasons=set(record["dirty_reasons"]),
+    )
@@ -17,6 +17,7 @@
 
 """Facts Carousel"""
 
+import asyncio
 import re
 import time
 from datetime import timedelta
@@ -469,12 +470,14 @@ class UpdateHandler(object):
     def final_commando(self, event):
         """"""
         # Reset the status message first, because the command being called
-        # may have something to say.
+        # may have something to say. And unwire the commando keys first, in
+        # case the command wires its own (e.g., save ignores keys mid-save).
+        typed_commando = self.typed_commando
         self.zone_manager.zone_lowdown.reset_status()
-        hot_notif = self.colon_commando(event, self.typed_commando)
+        self.reset_commando()
+        hot_notif = self.colon_commando(event, typed_commando)
         if hot_notif:
             self.zone_manager.zone_lowdown.update_status(hot_notif)
-        self.reset_commando()
 
     def reset_commando(self):
         del self.began_commando
@@ -502,13 +505,19 @@ class UpdateHandler(object):
             if save_exit_message_linger <= 0:
                 self.carousel.save_edited_and_exit(event)
             else:
-                self.carousel.save_edited_and_live(event)
-                # Hang out briefly to provide 'save' command feedback (via
-                # 'Saved {} Facts' status message). (lb): This seems like a
-                # good thing for new users; veteran dobbers will probably
-                # disable (by setting configurable option to '0' seconds).
-                time.sleep(save_exit_message_linger)
-                self.carousel.exit_command(event)
+
+                async def linger_then_exit():
+                    # Hang out briefly to provide 'save' command feedback (via
+                    # 'Saved {} Facts' status message). (lb): This seems like a
+                    # good thing for new users; veteran dobbers will probably
+                    # disable (by setting configurable option to '0' seconds).
+                    await asyncio.sleep(save_exit_message_linger)
+                    self.carousel.exit_command(event)
+
+                self.carousel.save_edited_and_live(
+                    event,
+                    after_save=linger_then_exit,
+                )
         else:
             # (lb): Copying Vim's message for now. Verbatim. Don't judge.
             msg = "E492: Not an editor command: {}".format(typed_commando)
@@ -17,6 +17,7 @@
 
 """Facts Carousel "Matter" (Fact Description) / Content area"""
 
+from collections import OrderedDict
 from functools import update_wrapper
 
 from prompt_toolkit.filters import Always, Never
@@ -34,6 +35,12 @@ class ZoneContent(object):
     def __init__(self, carousel):
         self.carousel = carousel
         self.showing_help = 0
+        # The facts_fingerprint last styled, so refresh can skip the rules.
+        self.style_fingerprint = None
+        # What the content buffer holds, so refresh can skip resetting it.
+        self.content_key = None
+        # Recently wrapped descriptions, by (pk, description hash, width).
+        self.wrapped_cache = OrderedDict()
         # For your convenience, attributes to eliminate one object hop.
         self.content_lexer = self.carousel.content_lexer
         self.style_classes = self.carousel.style_classes
@@ -135,7 +142,9 @@ class ZoneContent(object):
     # ***
 
     def selectively_refresh(self):
-        self.rebuild_viewable()
+        # Nothing in the content area follows the clock, so this only
+        # resets the buffer if the description (or help page) changed.
+        self.refresh_content()
 
     # ***
 
@@ -211,11 +220,17 @@ class ZoneContent(object):
     # ***
 
     def rebuild_viewable(self):
-        content_text = self.apply_scrollable_style()
+        self.refresh_content()
+        return self.scrollable_frame.container
+
+    def refresh_content(self):
+        content_key, content_text = self.apply_scrollable_style()
+        if content_key == self.content_key:
+            return
+        self.content_key = content_key
         self.content.buffer.read_only = Never()
         self.content.buffer.text = content_text
         self.content.buffer.read_only = Always()
-        return self.scrollable_frame.container
 
     def apply_scrollable_style(self):
         if self.showing_help:
@@ -224,18 +239,27 @@ class ZoneContent(object):
             return self.apply_scrollable_style_fact()
 
     def apply_scrollable_style_help(self):
+        self.style_fingerprint = None
         self.scrollable_frame.container.style = "class:content-help"
         # MAYBE: (lb): It is easy to format a PPT Frame's content?
         #   (I tried passing HTML(CAROUSEL_HELP) but, uh, nope.)
         #   (This is not too important; I thought it might be nice
         #   (polishing feature) to beautify the help (even more).)
-        return render_carousel_help()
+        return ("help",), render_carousel_help()
 
     def apply_scrollable_style_fact(self):
-        self.scrollable_frame.container.style = "class:content-fact"
-
         curr_edit = self.carousel.edits_manager.curr_edit
 
+        facts_fingerprint = self.carousel.zone_manager.facts_fingerprint
+        if self.style_fingerprint != facts_fingerprint:
+            self.style_fingerprint = facts_fingerprint
+            self.apply_scrollable_style_classes(curr_edit)
+
+        return self.wrapped_description(curr_edit)
+
+    def apply_scrollable_style_classes(self, curr_edit):
+        self.scrollable_frame.container.style = "class:content-fact"
+
         # BACKLOG: Fact InterVal GaP Interval
         # MAYBE: Don't color after edited/added?
         #        Or probably 'unsaved-fact' style will override.
@@ -261,11 +285,22 @@ class ZoneContent(object):
             fact=curr_edit,
         )
 
-        content_text = curr_edit.description or ""
-
+    WRAPPED_CACHE_SIZE = 32
+
+    def wrapped_description(self, fact):
+        content_text = fact.description or ""
+        # (lb): Python caches a str's hash, so this is cheap on each tick.
+        content_key = (fact.pk, hash(content_text), self.content_width)
+        try:
+            self.wrapped_cache.move_to_end(content_key)
+            return content_key, self.wrapped_cache[content_key]
+        except KeyError:
+            pass
         content_text = self.wrap_on_whitespace_maybe(content_text)
-
-        return content_text
+        self.wrapped_cache[content_key] = content_text
+        if len(self.wrapped_cache) > ZoneContent.WRAPPED_CACHE_SIZE:
+            self.wrapped_cache.popitem(last=False)
+        return content_key, content_text
 
     def wrap_on_whitespace_maybe(self, content_text):
         # FIXME/BACKLOG/2019-01-21: Old comment:
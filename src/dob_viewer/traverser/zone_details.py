@@ -37,6 +37,21 @@ from .zone_details_time_start import ZoneDetails_TimeStart
 __all__ = ("ZoneDetails",)
 
 
+# The Fact fields each header line diffs, so a line is only recomputed when
+# its own fields change, e.g., a time nudge doesn't redo the tags diff.
+DIFF_PART_FIELDS = {
+    "duration": ("start", "end"),
+    "start": ("start",),
+    "end": ("end",),
+    "activity": ("activity_name",),
+    "category": ("category_name",),
+    "tags": ("tags",),
+}
+
+# The header lines that show <now> when the Fact is open, which we won't cache.
+DIFF_PARTS_NOWWED = ("duration", "end")
+
+
 class ZoneDetails(
     ZoneDetails_TimeStart,
     ZoneDetails_TimeEnd,
@@ -47,6 +62,11 @@ class ZoneDetails(
         super(ZoneDetails, self).__init__()
         self.carousel = carousel
         self.active_widgets = None
+        self.blank_line_fingerprint = None
+        # Whether the Fact was open (had no end) when last refreshed.
+        self.showing_open_fact = None
+        # Diff tuples per header line, by the fields that line depends on.
+        self.diff_tuples_cache = {}
         # Convenience attrs.
         self.affirm = self.carousel.controller.affirm
         self.debug = self.carousel.controller.client_logger.debug
@@ -75,6 +95,8 @@ class ZoneDetails(
             self.text_area = text_area
             self.orig_val = orig_val
             self.mouse_handler = mouse_handler
+            # What the value label last showed, so refresh can skip it.
+            self.fingerprint = None
 
     # ***
 
@@ -313,23 +335,23 @@ class ZoneDetails(
         self.refresh_time_start()
         # Update the <now> time duration that FactsDiff shows.
         self.refresh_time_end()
+        # If the user cleared (or set) the end time, start (or stop) the clock.
+        self.tick_wake_if_opened_or_closed()
+
+    def tick_wake_if_opened_or_closed(self):
+        # (lb): The clock tick calls this, too, so don't wake it every time,
+        # or it'll refresh twice as often as it needs to.
+        showing_open_fact = self.carousel.edits_manager.curr_edit.end is None
+        if showing_open_fact == self.showing_open_fact:
+            return
+        self.showing_open_fact = showing_open_fact
+        self.carousel.tick_wake()
 
     # ***
 
     def refresh_duration(self):
-        # The style_class is 'class:value-normal class:value-duration '.
-        style_class = self.assemble_style_class_for_part(self.label_duration)
-        orig_val, edit_val = self.zone_manager.facts_diff.diff_time_elapsed(
-            show_now=True,
-            style_class=style_class,
-        )
-        diff_tuples = self.zone_manager.facts_diff.diff_line_tuples_style(
-            orig_val,
-            edit_val,
-            style_class=style_class,
-        )
-        self.label_duration.val_label.text = diff_tuples
-        self.process_style_rules(self.label_duration)
+        diff_tuples = self.diff_tuples_cached(self.label_duration)
+        self.refresh_val_label(self.label_duration, diff_tuples)
 
     def refresh_activity(self):
         self.refresh_val_widgets(self.widgets_activity)
@@ -341,6 +363,10 @@ class ZoneDetails(
         self.refresh_val_widgets(self.widgets_tags)
 
     def refresh_blank_line(self):
+        facts_fingerprint = self.zone_manager.facts_fingerprint
+        if self.blank_line_fingerprint == facts_fingerprint:
+            return
+        self.blank_line_fingerprint = facts_fingerprint
         # Lets the user override the blank line style for matching rules.
         custom_classes = self.carousel.process_style_rules(
             ppt_widget=None,
@@ -353,23 +379,97 @@ class ZoneDetails(
         self.blank_line.window.style = custom_classes or "class:label class:blank-line "
 
     def refresh_val_widgets(self, keyval_widgets):
-        self.affirm(keyval_widgets.fact_attr)
-        # The style_class is 'class:value-normal class:value-{activity|category|etc} '.
-        style_class = self.assemble_style_class_for_part(keyval_widgets)
-        diff_tuples = self.zone_manager.facts_diff.diff_attrs(
-            keyval_widgets.fact_attr,
-            style_class=style_class,
-            mouse_handler=keyval_widgets.mouse_handler,
-            **keyval_widgets.diff_kwargs
+        diff_tuples = self.diff_tuples_cached(keyval_widgets)
+        # (lb): Note also widgets_start and widgets_end come through here.
+        self.refresh_val_label(keyval_widgets, diff_tuples)
+
+    def refresh_val_label(self, keyval_widgets, diff_tuples):
+        # The refresh runs on every clock tick, but usually only the duration
+        # (and an active Fact's end) changes. Skip the rest, especially the
+        # style rules, which append classes to the widget styles each pass.
+        fingerprint = (
+            self.zone_manager.facts_fingerprint,
+            self.active_widgets is keyval_widgets,
+            diff_tuples,
         )
+        if keyval_widgets.fingerprint == fingerprint:
+            return
+        keyval_widgets.fingerprint = fingerprint
         keyval_widgets.val_label.text = diff_tuples
         # We've already set the default value (on top of PPT's Label default class):
         #   keyval_widgets.val_label.window.style:
         #     'class:label class:value-normal-line'
         # and now we'll set value-{normal|activity|category|etc}[-line], if rules apply.
-        # (lb): Note also widgets_start and widgets_end come through here.
         self.process_style_rules(keyval_widgets)
 
+    DIFF_TUPLES_CACHE_SIZE = 1024
+
+    def diff_tuples_cached(self, keyval_widgets, facts_diff=None):
+        facts_diff = facts_diff or self.zone_manager.facts_diff
+        cache_key = self.diff_tuples_key(keyval_widgets.what_part, facts_diff)
+        if cache_key is None:
+            return self.diff_tuples(keyval_widgets, facts_diff)
+        try:
+            return self.diff_tuples_cache[cache_key]
+        except KeyError:
+            pass
+        if len(self.diff_tuples_cache) >= ZoneDetails.DIFF_TUPLES_CACHE_SIZE:
+            self.diff_tuples_cache = {}
+        diff_tuples = self.diff_tuples(keyval_widgets, facts_diff)
+        self.diff_tuples_cache[cache_key] = diff_tuples
+        return diff_tuples
+
+    def diff_tuples(self, keyval_widgets, facts_diff):
+        # The style_class is 'class:value-normal class:value-{duration|etc} '.
+        style_class = self.assemble_style_class_for_part(keyval_widgets)
+        if keyval_widgets is self.label_duration:
+            orig_val, edit_val = facts_diff.diff_time_elapsed(
+                show_now=True,
+                style_class=style_class,
+            )
+            return facts_diff.diff_line_tuples_style(
+                orig_val,
+                edit_val,
+                style_class=style_class,
+            )
+        self.affirm(keyval_widgets.fact_attr)
+        return facts_diff.diff_attrs(
+            keyval_widgets.fact_attr,
+            style_class=style_class,
+            mouse_handler=keyval_widgets.mouse_handler,
+            **keyval_widgets.diff_kwargs
+        )
+
+    def prefetch_diff_tuples(self, facts_diff):
+        """Fills the diff tuples cache for a Fact the user might view next."""
+        for keyval_widgets in (
+            self.widgets_start,
+            self.widgets_end,
+            self.label_duration,
+            self.widgets_activity,
+            self.widgets_category,
+            self.widgets_tags,
+        ):
+            self.diff_tuples_cached(keyval_widgets, facts_diff)
+
+    def diff_tuples_key(self, what_part, facts_diff):
+        orig_fact = facts_diff.orig_fact
+        edit_fact = facts_diff.edit_fact
+        if what_part in DIFF_PARTS_NOWWED:
+            if orig_fact.end is None or edit_fact.end is None:
+                return None
+
+        def field_vals(fact):
+            vals = []
+            for field in DIFF_PART_FIELDS[what_part]:
+                val = getattr(fact, field)
+                if field == "tags":
+                    val = tuple(tag.name for tag in val)
+                vals.append(val)
+            return tuple(vals)
+
+        return (what_part, orig_fact.pk, field_vals(orig_fact), field_vals(edit_fact))
+
     def assemble_style_class_for_part(self, keyval_widgets):
         style_class = "class:value-normal "
         style_class += "class:value-{} ".format(keyval_widgets.what_part)
@@ -513,6 +613,8 @@ class ZoneDetails(
         # ***
 
         self.process_style_rules(keyval_widgets, set_focus=set_focus)
+        # The styles were just reset, so have the next refresh reapply rules.
+        keyval_widgets.fingerprint = None
 
     def replace_val_container_label(self, keyval_widgets):
         self.replace_val_container(
@@ -634,9 +736,9 @@ class ZoneDetails(
             edit_text = self.active_widgets.text_area.text
             # Note that carousel.edits_manager.curr_edit returns fact-under-edit
             # only if one already exists, but fact may be unedited, in which case
-            # it'd return the original, unedited fact. So use the editable fact we
-            # made earlier.
-            edit_fact = self.zone_manager.facts_diff.edit_fact
+            # it'd return the original, unedited fact. So ask for an editable fact,
+            # which copies the fact if necessary (and which the diff then shows).
+            edit_fact = self.zone_manager.editable_diff_fact()
             apply_edited_time(edit_fact, edit_text)
             return leave_okayed[0]
 
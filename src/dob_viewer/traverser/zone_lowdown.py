@@ -41,7 +41,12 @@ class ZoneLowdown(object):
     def update_status(self, hot_notif, clear_after_secs=None):
         self.hot_notif = hot_notif
         self.status_label.text = self.format_lowdown_text()
+        was_expiry = self.notif_expiry
         self.reset_notif_expiry(clear_after_secs)
+        # Let the clock tick know when to clear the message, unless it already
+        # wakes up sooner (e.g., the gap Fact status is reset on every refresh).
+        if self.notif_expiry and (not was_expiry or self.notif_expiry < was_expiry):
+            self.carousel.tick_wake()
 
     LOWDOWN_NOTIFY_MESSAGE_LIFETIME_SECS = 2.71828
 
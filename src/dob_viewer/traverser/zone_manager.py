@@ -40,6 +40,8 @@ from prompt_toolkit.widgets import Box, Label
 
 from ..ptkui.dialog_overlay import alert_and_question
 from .exceptions import catch_action_exception
+from .lazy_logger import LazyDebugLogger
+from .style_rules_cache import fact_fingerprint
 from .zone_content import ZoneContent
 from .zone_details import ZoneDetails
 from .zone_lowdown import ZoneLowdown
@@ -53,6 +55,7 @@ class ZoneManager(object):
 
     def __init__(self, carousel):
         self.carousel = carousel
+        self.debug = LazyDebugLogger(carousel.controller.client_logger)
         self.facts_diff = None
 
         self.zone_streamer = ZoneStreamer(self.carousel)
@@ -63,6 +66,8 @@ class ZoneManager(object):
         self.alert_showing = False
         self.silence_alert_overlapped = False
 
+        self.application = None
+
     # ***
 
     def standup(self):
@@ -75,13 +80,29 @@ class ZoneManager(object):
     # ***
 
     def build_and_show(self, **kwargs):
-        self.root = self.build_root_container()
-        self.layout = self.build_application_layout()
-        self.setup_styling()
+        if self.application is None:
+            self.root = self.build_root_container()
+            self.layout = self.build_application_layout()
+            self.setup_styling()
+            self.application = self.build_application_object(**kwargs)
+        else:
+            # Back from an edit prompt (or a rerun), so reuse the widgets,
+            # the compiled Style, and the Application, and just reset them.
+            self.reset_application()
         self.center_thyself()
-        self.application = self.build_application_object(**kwargs)
         self.rebuild_viewable()
 
+    def reset_application(self):
+        # Drop any dialog that was showing when the app exited.
+        self.root.floats[:] = []
+        self.alert_showing = False
+        # The terminal might have been resized while the user was away.
+        self.vsplit.align, self.vsplit.width = self.app_align_and_width()
+        # Start again where the user starts on a new Carousel: the content.
+        self.layout.focus(self.content_control)
+        self.focus_recent = self.content_control
+        self.carousel.action_manager.wire_keys_normal()
+
     # ***
 
     def build_root_container(self):
@@ -103,6 +124,18 @@ class ZoneManager(object):
             #  padding_style='',
         )
 
+        app_align, app_width = self.app_align_and_width()
+
+        self.vsplit = VSplit(
+            [self.hsplit],
+            align=app_align,
+            width=app_width,
+        )
+
+        root_container = FloatContainer(Box(body=self.vsplit), floats=[])
+        return root_container
+
+    def app_align_and_width(self):
         if self.carousel.style_classes["editor-align"] == "LEFT":
             app_align = HorizontalAlign.LEFT
             app_width = shutil.get_terminal_size()[0]
@@ -116,15 +149,7 @@ class ZoneManager(object):
             # self.carousel.style_classes['editor-align'] == 'JUSTIFY'
             app_align = HorizontalAlign.JUSTIFY
             app_width = None
-
-        self.vsplit = VSplit(
-            [self.hsplit],
-            align=app_align,
-            width=app_width,
-        )
-
-        root_container = FloatContainer(Box(body=self.vsplit), floats=[])
-        return root_container
+        return app_align, app_width
 
     def build_application_layout(self):
         layout = Layout(
@@ -259,12 +284,52 @@ class ZoneManager(object):
 
     def reset_diff_fact(self):
         orig_fact = self.carousel.edits_manager.curr_orig
-        # Call editable_fact, which either gets the edit_fact, or gets
-        # a copy of the orig_fact; but it does not make an undo.
-        edit_fact = self.carousel.edits_manager.editable_fact()
+        # Use curr_edit, which is the edit_fact, or the current fact, and not
+        # editable_fact, which copies the fact, which is wasted effort when the
+        # user is just looking. The diff only reads the fact; the edit paths
+        # call editable_diff_fact, which makes the copy on write.
+        edit_fact = self.carousel.edits_manager.curr_edit
+        # The fact might be active (or no longer), so re-time the clock.
+        self.carousel.tick_wake()
+        if (
+            self.facts_diff is not None
+            and self.facts_diff.orig_fact is orig_fact
+            and self.facts_diff.edit_fact is edit_fact
+        ):
+            # Same facts, e.g., after a time nudge, so no need for a new diff.
+            # (ZoneDetails caches each line's diff by the fields it shows.)
+            return
         self.facts_diff = FactsDiff(orig_fact, edit_fact, formatted=True)
-        self.carousel.controller.client_logger.debug(
-            "facts_diff: {}".format(self.facts_diff),
+        self.debug("facts_diff: {}", self.facts_diff)
+
+    def prefetch_fact(self, orig_fact, edit_fact):
+        """Renders a Fact's details and content ahead of time, to warm the caches."""
+        facts_diff = FactsDiff(orig_fact, edit_fact, formatted=True)
+        self.zone_details.prefetch_diff_tuples(facts_diff)
+        self.zone_content.wrapped_description(edit_fact)
+
+    def editable_diff_fact(self):
+        """Returns the diff's edit fact, after ensuring it's safe to modify."""
+        edit_fact = self.carousel.edits_manager.editable_fact()
+        if self.facts_diff.edit_fact is not edit_fact:
+            # Show the copy in the diff, as that's the fact the user is editing.
+            self.facts_diff.edit_fact = edit_fact
+        return edit_fact
+
+    @property
+    def facts_fingerprint(self):
+        """Returns a hashable snapshot of the fact fields the zones render.
+
+        The zones compare this against what they last drew, so that the
+        periodic refresh skips widgets (and style rules) whose inputs have
+        not changed. It's computed on demand because the edit fact is
+        modified in place, so the facts_diff object alone is no indication.
+        """
+        if self.facts_diff is None:
+            return None
+        return (
+            fact_fingerprint(self.facts_diff.orig_fact),
+            fact_fingerprint(self.facts_diff.edit_fact),
         )
 
     def rebuild_containers(self):
@@ -416,6 +481,7 @@ class ZoneManager(object):
         jump_msg = self.jump_msg_with_count(count, _("Backward"), _("Fact"))
         prev_fact = self.carousel.edits_manager.jump_fact_dec(count=count)
         self.finalize_jump_dec(prev_fact, jump_msg)
+        self.carousel.prefetch_hint(-1)
 
     @catch_action_exception
     @ZoneContent.Decorators.reset_showing_help
@@ -425,6 +491,7 @@ class ZoneManager(object):
         jump_msg = self.jump_msg_with_count(count, _("Forward"), _("Fact"))
         next_fact = self.carousel.edits_manager.jump_fact_inc(count=count)
         self.finalize_jump_inc(next_fact, jump_msg)
+        self.carousel.prefetch_hint(1)
 
     # ***
 
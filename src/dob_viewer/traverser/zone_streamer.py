@@ -30,6 +30,8 @@ class ZoneStreamer(object):
 
     def __init__(self, carousel):
         self.carousel = carousel
+        # The banner text and facts_fingerprint last shown.
+        self.fingerprint = None
 
     def standup(self):
         """"""
@@ -89,6 +91,12 @@ class ZoneStreamer(object):
     def refresh_interval(self):
         tod_humanize = self.zone_manager.facts_diff.edit_fact.time_of_day_humanize
         interval_text = tod_humanize(show_now=True)
+        # Skip the update (and its style rules) unless something changed,
+        # e.g., the end time of the active Fact, which follows <now>.
+        fingerprint = (interval_text, self.zone_manager.facts_fingerprint)
+        if self.fingerprint == fingerprint:
+            return
+        self.fingerprint = fingerprint
         self.interval_banner.text = self.bannerize(interval_text)
         # (lb): Not sure why, but unlike process_style_rules, which sets
         # widget.formatted_text_control.style, here we set widget.window's
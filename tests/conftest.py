@@ -15,8 +15,11 @@
 # If you lost the GNU General Public License that ships with this software
 # repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
 
+import os
+
 import pytest
 from dob_bright.crud.fact_dressed import FactDressed
+from dob_bright.crud.parse_input import parse_input
 
 # When dob was split into Packages of Four, all the fixtures were sent to
 # dob-bright. Import those fixtures into the test namespace with a *-glob,
@@ -34,3 +37,31 @@ pytest_plugins = (
 @pytest.fixture
 def test_fact_cls():
     return FactDressed
+
+
+@pytest.fixture
+def controller_with_journal(controller_with_logging, tmpdir):
+    # The journal lives beside the data store, which is otherwise in-memory.
+    db_path = os.path.join(tmpdir.strpath, "dob.sqlite")
+    controller_with_logging.config["db.path"] = db_path
+    return controller_with_logging
+
+
+IMPORT_PATH = "./tests/fixtures/test-import-fixture.rst"
+"""Path to the import file fixture, which is full of Factoids."""
+
+
+@pytest.fixture
+def import_facts(controller_with_logging):
+    """Returns a function that parses the import fixture into new Facts."""
+
+    def _import_facts():
+        # Linux & macOS default UTF-8. Windows defaults cp1252 and dies on '”'.
+        with open(IMPORT_PATH, "r", encoding="utf8") as input_stream:
+            return parse_input(
+                controller_with_logging,
+                file_in=input_stream,
+                progress=None,
+            )
+
+    return _import_facts
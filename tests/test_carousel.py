@@ -18,28 +18,20 @@
 from contextlib import closing
 
 import pytest
-from dob_bright.crud.parse_input import parse_input
 from prompt_toolkit.input.defaults import create_pipe_input
 from prompt_toolkit.output import DummyOutput
 
+# Register the Carousel's "editor" settings.
+import dob_viewer.config  # noqa: F401
 from dob_viewer.ptkui import re_confirm
+from dob_viewer.traverser import edits_manager, fact_stream
+from dob_viewer.traverser.edits_manager import EditsManager
 from dob_viewer.traverser.save_confirmer import prompt_and_save_confirmer
 
 
 @pytest.fixture
-def new_facts(controller_with_logging):
-    # Linux & macOS default UTF-8. Windows defaults cp1252 and dies on '”'.
-    input_stream = open(IMPORT_PATH, "r", encoding="utf8")
-    new_facts = parse_input(
-        controller_with_logging,
-        file_in=input_stream,
-        progress=None,
-    )
-    return new_facts
-
-
-IMPORT_PATH = "./tests/fixtures/test-import-fixture.rst"
-"""Path to the import file fixture, which is full of Factoids."""
+def new_facts(import_facts):
+    return import_facts()
 
 
 class TestBasicCarousel(object):
@@ -112,6 +104,21 @@ class TestBasicCarousel(object):
                 #                   But apparently we need 4 strokes to exit.
                 "\x11",
             ],
+            # *** test_basic_import4_count_arrows
+            #
+            [
+                # Jump back three Facts, then forward two, then overshoot.
+                "3",
+                "\x1bOD",
+                "2",
+                "\x1bOC",
+                "9",
+                "9",
+                "\x1bOC",
+                "\x11",
+                "\x11",
+                "\x11",
+            ],
             # *** test_basic_import4_G_go_last
             [
                 # Jump to final fact.
@@ -135,3 +142,212 @@ class TestBasicCarousel(object):
             "".join(key_sequence),
             mocker,
         )
+
+    # ***
+
+    def test_basic_import4_streamed(
+        self,
+        controller_with_logging,
+        new_facts,
+        mocker,
+    ):
+        # Pass an iterator, and the Carousel streams the Facts, one at a time.
+        mocker.patch.object(fact_stream, "STREAM_BATCH_SIZE", 1)
+        self._feed_cli_with_input(
+            controller_with_logging,
+            iter(new_facts),
+            "".join(["\x1bOC", "\x1bOC", "G", "\x11", "\x11", "\x11"]),
+            mocker,
+        )
+
+    def test_basic_import4_streamed_recovers_journal(
+        self,
+        controller_with_journal,
+        import_facts,
+        mocker,
+    ):
+        mocker.patch.object(fact_stream, "STREAM_BATCH_SIZE", 2)
+        # Edit the final import Fact, and then crash, leaving the journal.
+        crashed = EditsManager(controller_with_journal, edit_facts=iter(import_facts()))
+        crashed.stand_up()
+        crashed.drain_fact_stream()
+        fact_count = len(crashed.conjoined)
+        crashed.curr_fact = crashed.conjoined.by_pk[-fact_count]
+        edit_fact = crashed.undoable_editable_fact(what="test-streamed")
+        edit_fact.description = "Journaled edit"
+        crashed.apply_edits(edit_fact)
+        crashed.undo_journal.sync()
+        crashed.undo_journal.close()
+
+        # Stream the import anew, recover (confirm is patched), and jump to the end.
+        restore_journal = mocker.spy(EditsManager, "restore_journal")
+        self._feed_cli_with_input(
+            controller_with_journal,
+            iter(import_facts()),
+            "".join(["G", "\x11", "\x11", "\x11"]),
+            mocker,
+        )
+
+        recovered = restore_journal.call_args[0][0]
+        assert not recovered.streaming
+        # The recovered Fact replaced its import Fact, and was not streamed twice.
+        assert len(recovered.conjoined) == fact_count
+        assert len(recovered.conjoined.groups) == 1
+        assert -(fact_count + 1) not in recovered.conjoined.by_pk
+        assert recovered.conjoined.by_pk[-fact_count].description == "Journaled edit"
+
+    # ***
+
+    def test_basic_import4_reuses_widgets_after_edit_prompt(
+        self,
+        controller_with_logging,
+        new_facts,
+        mocker,
+    ):
+        mocker.patch.object(re_confirm, "confirm", return_value=True)
+        # Import after patching confirm, which the carousel module imports.
+        from dob_viewer.traverser.carousel import Carousel
+
+        # The test style conf echoes a warning, which would otherwise pause
+        # the Carousel for acknowledgement before it starts up again.
+        mocker.patch.object(Carousel, "pause_on_error_message_maybe", return_value=True)
+
+        applications = []
+
+        def user_prompt_edit_fact(carousel, used_prompt):
+            # Rather than prompt, set the description, and then send the
+            # Carousel its next keys (which would be lost if sent up front,
+            # because the first Application would read them all).
+            applications.append(carousel.zone_manager.application)
+            edit_fact = carousel.edits_manager.undoable_editable_fact(what="test")
+            edit_fact.description = "edited"
+            carousel.edits_manager.apply_edits(edit_fact)
+            inp.send_text(next(more_keys))
+            return used_prompt
+
+        mocker.patch.object(Carousel, "user_prompt_edit_fact", user_prompt_edit_fact)
+
+        more_keys = iter(["\x1bOCd", "\x11\x11\x11"])
+        inp_gen = create_pipe_input()
+        with closing(next(inp_gen.gen)) as inp:
+            # Edit the description, then move right and edit it again.
+            inp.send_text("d")
+            prompt_and_save_confirmer(
+                controller_with_logging,
+                edit_facts=new_facts,
+                input=inp,
+                output=DummyOutput(),
+            )
+
+        assert len(applications) == 2
+        assert applications[0] is applications[1]
+
+    # ***
+
+    def test_basic_import4_paints_save_progress(
+        self,
+        controller_with_logging,
+        new_facts,
+        mocker,
+    ):
+        mocker.patch.object(re_confirm, "confirm", return_value=True)
+        mocker.patch.object(edits_manager, "SAVE_PROGRESS_EVERY", 20)
+        from dob_viewer.traverser.carousel import Carousel
+
+        mocker.patch.object(Carousel, "pause_on_error_message_maybe", return_value=True)
+
+        # The status messages, as painted, and when the save finished.
+        painted = []
+        show_save_progress = Carousel.show_save_progress
+        show_saved_facts = Carousel.show_saved_facts
+
+        def spy_save_progress(self, saved_cnt, total_cnt):
+            if not painted:
+                # Start recording what's painted at the first progress update.
+                lowdown = self.zone_manager.zone_lowdown
+                self.zone_manager.application.before_render += (
+                    lambda app: painted.append(lowdown.hot_notif)
+                )
+                painted.append(None)
+            show_save_progress(self, saved_cnt, total_cnt)
+
+        def spy_saved_facts(self, curr_fact, saved_facts):
+            painted.append("Saved!")
+            show_saved_facts(self, curr_fact, saved_facts)
+            # Keys pressed while saving are ignored, so quit after the save.
+            inp.send_text("\x11\x11\x11")
+
+        mocker.patch.object(Carousel, "show_save_progress", spy_save_progress)
+        mocker.patch.object(Carousel, "show_saved_facts", spy_saved_facts)
+
+        inp_gen = create_pipe_input()
+        with closing(next(inp_gen.gen)) as inp:
+            # Save (Ctrl-S).
+            inp.send_text("\x13")
+            prompt_and_save_confirmer(
+                controller_with_logging,
+                edit_facts=new_facts,
+                input=inp,
+                output=DummyOutput(),
+            )
+
+        # The progress was painted while saving, before the save finished.
+        saved_at = painted.index("Saved!")
+        assert any(
+            status.startswith("Saving… 20 of ")
+            for status in painted[:saved_at]
+            if status
+        )
+        assert len(controller_with_logging.facts.get_all()) > 0
+
+    # ***
+
+    def test_basic_import4_prefetches_neighbors(
+        self,
+        controller_with_logging,
+        new_facts,
+        mocker,
+    ):
+        mocker.patch.object(re_confirm, "confirm", return_value=True)
+        from dob_viewer.traverser.carousel import Carousel
+
+        mocker.patch.object(Carousel, "pause_on_error_message_maybe", return_value=True)
+
+        prefetched = {}
+        viewed = {}
+
+        def user_prompt_edit_fact(carousel, used_prompt):
+            # Rather than prompt, warm the neighbors (like the prefetcher
+            # does when the user goes idle), and then step to the next Fact.
+            zone_content = carousel.zone_manager.zone_content
+            zone_details = carousel.zone_manager.zone_details
+            if not prefetched:
+                wrapped_keys = set(zone_content.wrapped_cache)
+                diff_keys = set(zone_details.diff_tuples_cache)
+                carousel.warm_neighbors(forward=True, backward=False)
+                prefetched["wrapped"] = set(zone_content.wrapped_cache) - wrapped_keys
+                prefetched["diffs"] = set(zone_details.diff_tuples_cache) - diff_keys
+                inp.send_text("\x1bOCd")
+            else:
+                viewed["pk"] = carousel.edits_manager.curr_fact.pk
+                viewed["wrapped"] = zone_content.content_key
+                inp.send_text("\x11\x11\x11")
+            return used_prompt
+
+        mocker.patch.object(Carousel, "user_prompt_edit_fact", user_prompt_edit_fact)
+
+        inp_gen = create_pipe_input()
+        with closing(next(inp_gen.gen)) as inp:
+            inp.send_text("d")
+            prompt_and_save_confirmer(
+                controller_with_logging,
+                edit_facts=new_facts,
+                input=inp,
+                output=DummyOutput(),
+            )
+
+        # The Fact the user stepped to was rendered from the warmed caches.
+        assert viewed["wrapped"] in prefetched["wrapped"]
+        assert set(
+            (diff_key[0], diff_key[1]) for diff_key in prefetched["diffs"]
+        ) >= set((what_part, viewed["pk"]) for what_part in ("activity", "tags"))
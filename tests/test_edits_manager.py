@@ -0,0 +1,70 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Fact editing state machine tests."""
+
+from unittest import mock
+
+# Register the Carousel's "editor" settings.
+import dob_viewer.config  # noqa: F401
+from dob_viewer.traverser.edits_manager import EditsManager
+
+
+class TestEditsManager(object):
+    """EditsManager save tests."""
+
+    # ***
+
+    def test_save_failure_rolls_back_transaction(
+        self, controller_with_logging, import_facts
+    ):
+        error_callback = mock.Mock()
+        edits_manager = EditsManager(
+            controller_with_logging,
+            edit_facts=import_facts(),
+            error_callback=error_callback,
+        )
+        edits_manager.stand_up()
+        edited_facts = edits_manager.prepared_facts
+        save_states = [
+            (fact.pk, fact.deleted, fact.split_from) for fact in edited_facts
+        ]
+
+        facts_save = controller_with_logging.facts.save
+
+        def save_some_then_fail(fact, **kwargs):
+            if facts_save.call_count > 3:
+                raise Exception("Injected failure")
+            return controller_with_logging.facts.__class__.save(
+                controller_with_logging.facts, fact, **kwargs
+            )
+
+        with mock.patch.object(
+            controller_with_logging.facts,
+            "save",
+            side_effect=save_some_then_fail,
+        ) as facts_save:
+            _curr_fact, saved_facts = edits_manager.save_edited_facts()
+
+        assert facts_save.call_count == 4
+        assert saved_facts is None
+        assert error_callback.called
+        # Nothing was committed, not even the Facts saved before the failure.
+        assert controller_with_logging.facts.get_all() == []
+        assert [
+            (fact.pk, fact.deleted, fact.split_from) for fact in edited_facts
+        ] == save_states
@@ -0,0 +1,80 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Import time tests."""
+
+import subprocess
+import sys
+
+# The modules that dob imports whether or not the user runs the Carousel.
+EAGER_MODULES = (
+    "dob_viewer.config",
+    "dob_viewer.traverser.save_confirmer",
+)
+
+# The packages that only the Carousel needs, which should be loaded lazily.
+CAROUSEL_PACKAGES = (
+    "click_hotoffthehamster",
+    "dob_prompt",
+    "inflector",
+    "prompt_toolkit",
+    "pygments",
+)
+
+
+def _import_times(*modules):
+    """Returns the cumulative microseconds ``-X importtime`` reports by module."""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import {}".format(", ".join(modules)),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times = {}
+    for line in completed.stderr.splitlines():
+        # E.g., "import time:       643 |      52600 |   dob_viewer.config"
+        # (and skip anything else, e.g., a warning).
+        if not line.startswith("import time:"):
+            continue
+        _self_us, cumulative_us, module_name = line.split(":", 1)[1].split("|")
+        if not cumulative_us.strip().isdigit():
+            # The header line, "self [us] | cumulative | imported package".
+            continue
+        import_times[module_name.strip()] = int(cumulative_us)
+    return import_times
+
+
+class TestImportTime(object):
+    """Import time regression tests."""
+
+    # ***
+
+    def test_eager_modules_skip_carousel_packages(self):
+        import_times = _import_times(*EAGER_MODULES)
+
+        loaded = set(
+            module_name.split(".")[0]
+            for module_name in import_times
+            if module_name.split(".")[0] in CAROUSEL_PACKAGES
+        )
+        assert not loaded
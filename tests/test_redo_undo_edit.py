@@ -0,0 +1,190 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Undo/Redo history tests."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from dob_bright.crud.fact_dressed import FactDressed
+from nark.items.activity import Activity
+
+# Register the Carousel's "editor" settings.
+import dob_viewer.config  # noqa: F401
+from dob_viewer.traverser.edits_manager import EditsManager
+from dob_viewer.traverser.redo_undo_edit import (
+    UndoRedoStack,
+    UndoRedoTuple,
+    undo_redo_tuple_bytes,
+)
+
+
+def _undoable(pk, description=""):
+    start = datetime(2020, 1, 1)
+    fact = FactDressed(
+        Activity("Test"),
+        start,
+        start + timedelta(hours=1),
+        pk=pk,
+        description=description,
+    )
+    return UndoRedoTuple([fact], None, 0, "edit-{}".format(pk))
+
+
+@pytest.fixture
+def edits_manager(controller_with_logging, import_facts):
+    controller_with_logging.config["editor.undo_journal"] = False
+    controller_with_logging.config["editor.undo_max_entries"] = 2
+    edits_manager = EditsManager(
+        controller_with_logging,
+        edit_facts=import_facts(),
+    )
+    edits_manager.stand_up()
+    return edits_manager
+
+
+class TestUndoRedoStack(object):
+    """UndoRedoStack capacity tests."""
+
+    # ***
+
+    def test_max_entries_evicts_oldest_first(self):
+        evicted = []
+        stack = UndoRedoStack(max_entries=3, on_evict=evicted.append)
+        for pk in range(5):
+            stack.append(_undoable(pk))
+
+        assert [entry.what for entry in stack] == ["edit-2", "edit-3", "edit-4"]
+        assert [entry.what for entry in evicted] == ["edit-0", "edit-1"]
+        assert stack.evicted == 2
+        assert stack.nbytes == sum(undo_redo_tuple_bytes(entry) for entry in stack)
+
+    def test_max_bytes_evicts_oldest_first(self):
+        entry_bytes = undo_redo_tuple_bytes(_undoable(0, "x" * 1000))
+        evicted = []
+        stack = UndoRedoStack(
+            max_bytes=int(entry_bytes * 2.5),
+            on_evict=evicted.append,
+        )
+        for pk in range(4):
+            stack.append(_undoable(pk, "x" * 1000))
+
+        assert [entry.what for entry in stack] == ["edit-2", "edit-3"]
+        assert [entry.what for entry in evicted] == ["edit-0", "edit-1"]
+        assert stack.nbytes == entry_bytes * 2
+
+    def test_max_bytes_keeps_newest_entry(self):
+        stack = UndoRedoStack(max_bytes=1)
+        stack.append(_undoable(0))
+        stack.append(_undoable(1))
+
+        assert [entry.what for entry in stack] == ["edit-1"]
+        assert stack.evicted == 1
+
+    # ***
+
+    def test_undo_after_eviction(self, edits_manager):
+        original = edits_manager.curr_edit.description
+        for count in range(3):
+            edit_fact = edits_manager.undoable_editable_fact(
+                what="edit-{}".format(count),
+            )
+            edit_fact.description = "Edit {}".format(count)
+            edits_manager.apply_edits(edit_fact)
+        assert edits_manager.redo_undo.undo.evicted == 1
+
+        assert edits_manager.undo_last_edit()
+        assert edits_manager.curr_edit.description == "Edit 1"
+        assert edits_manager.undo_last_edit()
+        assert edits_manager.curr_edit.description == "Edit 0"
+        # The first edit was forgotten, so it cannot be undone.
+        assert not edits_manager.undo_last_edit()
+        assert edits_manager.curr_edit.description != original
+
+        assert edits_manager.redo_last_undo()
+        assert edits_manager.redo_last_undo()
+        assert edits_manager.curr_edit.description == "Edit 2"
+        assert not edits_manager.redo_last_undo()
+
+    def test_undo_references_live_facts(self, edits_manager):
+        edits_manager.redo_undo.undo.max_entries = 0
+        original = edits_manager.curr_edit.description
+        for count in range(3):
+            edit_fact = edits_manager.undoable_editable_fact(
+                what="edit-{}".format(count),
+            )
+            edit_fact.description = "Edit {}".format(count)
+            edits_manager.apply_edits(edit_fact)
+
+        undo = edits_manager.redo_undo.undo
+        assert len(undo) == 3
+        by_pk = edits_manager.conjoined.by_pk
+        # Each edit wires in a new copy, but no undo keeps the old copies.
+        for urt_changes in undo:
+            assert urt_changes.by_pk is by_pk
+            assert all(fact is by_pk[fact.pk] for fact in urt_changes.altered)
+        assert [fact.description for fact in undo[0].pristine] == [original]
+        assert [fact.description for fact in undo[-1].pristine] == ["Edit 1"]
+
+
+class TestEditTimeAdjust(object):
+    """Fact time nudge undo/redo tests."""
+
+    # ***
+
+    def test_repeated_nudges_compact_into_one_undo(self, edits_manager):
+        edits_manager.jump_fact_inc()
+        start = edits_manager.curr_fact.start
+        for _count in range(3):
+            edits_manager.time_edit.edit_time_adjust(timedelta(minutes=1), "start")
+
+        undo = edits_manager.redo_undo.undo
+        assert len(undo) == 1
+        assert edits_manager.curr_fact.start == start + timedelta(minutes=3)
+        time_deltas = [
+            delta for delta in undo[-1].deltas if delta.attr != "dirty_reasons"
+        ]
+        # The edited Fact's start, and the previous Fact's end.
+        assert [(delta.attr, delta.old, delta.new) for delta in time_deltas] == [
+            ("start", start, start + timedelta(minutes=3)),
+            ("end", start, start + timedelta(minutes=3)),
+        ]
+
+    def test_nudge_there_and_back_leaves_no_undo(self, edits_manager):
+        edits_manager.jump_fact_inc()
+        start = edits_manager.curr_fact.start
+        edits_manager.time_edit.edit_time_adjust(start + timedelta(minutes=5), "start")
+        edits_manager.time_edit.edit_time_adjust(start, "start")
+
+        assert len(edits_manager.redo_undo.undo) == 0
+        assert edits_manager.curr_fact.start == start
+
+    def test_undo_redo_round_trip(self, edits_manager):
+        edits_manager.jump_fact_inc()
+        start = edits_manager.curr_fact.start
+        for _count in range(2):
+            edits_manager.time_edit.edit_time_adjust(timedelta(minutes=1), "start")
+        live_fact = edits_manager.curr_fact
+
+        for _count in range(2):
+            assert edits_manager.undo_last_edit()
+            assert edits_manager.curr_fact.start == start
+            assert edits_manager.redo_last_undo()
+            assert edits_manager.curr_fact.start == start + timedelta(minutes=2)
+        # The live Fact was reverted in place, and not replaced by copies.
+        assert edits_manager.curr_fact is live_fact
+        assert not edits_manager.redo_last_undo()
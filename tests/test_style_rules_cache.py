@@ -0,0 +1,116 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Style rules cache tests."""
+
+from datetime import datetime
+
+from dob_bright.crud.fact_dressed import FactDressed
+from dob_bright.styling.style_engine import StyleEngine
+from nark.items.activity import Activity
+from nark.items.category import Category
+from prompt_toolkit.widgets.base import Label
+
+from dob_viewer.traverser.style_rules_cache import StyleRulesCache, fact_fingerprint
+
+
+class RulesConf(dict):
+    """A stand-in for the rules.conf ConfigObj."""
+
+    filename = "rules.conf"
+
+
+def _fact(end=datetime(2020, 1, 1, 11)):
+    return FactDressed(
+        activity=Activity("Coding", category=Category("Work")),
+        start=datetime(2020, 1, 1, 10),
+        end=end,
+        pk=1,
+    )
+
+
+def _style_rules_cache(rules):
+    style_engine = StyleEngine(RulesConf(rules))
+    return StyleRulesCache(style_engine, affirm=lambda condit: None)
+
+
+class TestStyleRulesCache(object):
+    """StyleRulesCache tests."""
+
+    # ***
+
+    def test_label_tuples_keep_final_rule_classes(self):
+        fact = _fact()
+        rules = {
+            "first": {
+                "activity": fact.activity_name,
+                "value-activity": "class:first",
+            },
+            "second": {
+                "category": fact.category_name,
+                "value-activity": "class:second",
+            },
+        }
+        style_rules = _style_rules_cache(rules)
+
+        engine_label = Label(text=[("", "Activity")])
+        expect = style_rules.style_engine.process_style_rules(
+            engine_label, "value-activity", fact
+        )
+
+        for _hit_or_miss in range(2):
+            cached_label = Label(text=[("", "Activity")])
+            assert expect == style_rules.process_style_rules(
+                cached_label, "value-activity", fact
+            )
+            assert (
+                cached_label.text
+                == engine_label.text
+                == [(" class:second", "Activity")]
+            )
+
+    # ***
+
+    def test_skip_cache_for_eval_rules_and_open_facts(self):
+        rules = {
+            "evaled": {
+                "__eval__": compile("fact.split_from", "<string>", "eval"),
+                "value-category": "class:evaled",
+            },
+            "plain": {
+                "activity": "Coding",
+                "value-activity": "class:plain",
+            },
+        }
+        style_rules = _style_rules_cache(rules)
+
+        fact = _fact()
+        assert not style_rules.rules_classes("value-category", fact)[0]
+        # Change a field that the fingerprint does not know about.
+        fact.split_from = 123
+        assert style_rules.rules_classes("value-category", fact)[0] == (" class:evaled")
+        assert style_rules.rules_classes("value-activity", fact)[0] == " class:plain"
+        assert list(style_rules.results) == [
+            (fact_fingerprint(fact), "value-activity"),
+        ]
+
+        style_rules.reset()
+        open_fact = _fact(end=None)
+        assert style_rules.rules_classes("value-activity", open_fact)[0] == (
+            " class:plain"
+        )
+        assert not style_rules.results
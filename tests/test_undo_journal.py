@@ -0,0 +1,183 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Undo journal tests."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from dob_bright.crud.fact_dressed import FactDressed
+from nark.items.activity import Activity
+
+# Register the Carousel's "editor" settings.
+import dob_viewer.config  # noqa: F401
+from dob_viewer.traverser.edits_manager import EditsManager
+from dob_viewer.traverser.redo_undo_edit import (
+    FactDelta,
+    UndoRedoStack,
+    UndoRedoTuple,
+)
+from dob_viewer.traverser.undo_journal import (
+    JOURNAL_COMPACT_RECORDS,
+    UndoJournal,
+    replay_undo_journal,
+)
+
+
+def _edits_manager(controller, edit_facts, recover=None):
+    if isinstance(recover, bool):
+        recover = mock.Mock(return_value=recover)
+    edits_manager = EditsManager(
+        controller,
+        edit_facts=edit_facts,
+        recover_callback=recover,
+    )
+    edits_manager.stand_up()
+    return edits_manager
+
+
+def _edited_session(controller, edit_facts):
+    edited = _edits_manager(controller, edit_facts)
+    # The first import Fact, PK -1.
+    edit_fact = edited.undoable_editable_fact(what="test-journal")
+    edit_fact.description = "Journaled edit"
+    edited.apply_edits(edit_fact)
+    edited.undo_journal.sync()
+    return edited
+
+
+class TestUndoJournal(object):
+    """Undo journal crash recovery tests."""
+
+    # ***
+
+    def test_recover_edits_and_undo_after_crash(
+        self, controller_with_journal, import_facts
+    ):
+        crashed = _edited_session(controller_with_journal, import_facts())
+        journal_path = crashed.undo_journal.path
+        # Simulate a crash: the journal is closed (and unlocked), but not discarded.
+        crashed.undo_journal.close()
+
+        recovered = _edits_manager(
+            controller_with_journal, import_facts(), recover=True
+        )
+        assert recovered.edit_facts[-1].description == "Journaled edit"
+        assert len(recovered.redo_undo.undo) == 1
+
+        recovered.curr_fact = recovered.conjoined.by_pk[-1]
+        assert recovered.undo_last_edit()
+        assert recovered.curr_edit.description != "Journaled edit"
+
+        recovered.close_undo_journal()
+        assert not os.path.exists(journal_path)
+
+    def test_declined_recovery_discards_journal(
+        self, controller_with_journal, import_facts
+    ):
+        crashed = _edited_session(controller_with_journal, import_facts())
+        journal_path = crashed.undo_journal.path
+        crashed.undo_journal.close()
+
+        declined = _edits_manager(
+            controller_with_journal, import_facts(), recover=False
+        )
+        assert declined.edit_facts[-1].description != "Journaled edit"
+        assert len(declined.redo_undo.undo) == 0
+        assert not os.path.exists(journal_path)
+
+    def test_skip_replay_into_other_session(
+        self, controller_with_journal, import_facts
+    ):
+        crashed = _edited_session(controller_with_journal, import_facts())
+        crashed.undo_journal.close()
+
+        recover_callback = mock.Mock(return_value=True)
+        other = EditsManager(
+            controller_with_journal,
+            # The same import PKs, but not the same Facts.
+            edit_facts=import_facts()[1:],
+            recover_callback=recover_callback,
+        )
+        assert not recover_callback.called
+        assert other.undo_journal.path != crashed.undo_journal.path
+        # The journal is not created until there's something to journal.
+        assert not os.path.exists(other.undo_journal.path)
+        assert os.path.exists(crashed.undo_journal.path)
+
+    def test_concurrent_session_is_locked_out(
+        self, controller_with_journal, import_facts
+    ):
+        running = _edited_session(controller_with_journal, import_facts())
+        with open(running.undo_journal.path, "r", encoding="utf8") as journal:
+            journaled = journal.read()
+
+        recover_callback = mock.Mock(return_value=True)
+        concurrent = _edits_manager(
+            controller_with_journal, import_facts(), recover=recover_callback
+        )
+        assert concurrent.undo_journal.locked_out
+        assert not recover_callback.called
+        edit_fact = concurrent.undoable_editable_fact(what="test-concurrent")
+        edit_fact.description = "Concurrent edit"
+        concurrent.apply_edits(edit_fact)
+        concurrent.close_undo_journal()
+
+        running.undo_journal.sync()
+        with open(running.undo_journal.path, "r", encoding="utf8") as journal:
+            assert journal.read() == journaled
+
+    # ***
+
+    @pytest.mark.parametrize(("edit_count"), [10000])
+    def test_journal_stays_compact(self, tmpdir, edit_count):
+        journal = UndoJournal(os.path.join(tmpdir.strpath, "dob-viewer.journal"))
+        undo = UndoRedoStack(max_entries=100, name="undo", journal=journal)
+        start = datetime(2020, 1, 1)
+        orig_fact = FactDressed(Activity("Bench"), start, start, pk=1)
+        orig_fact.orig_fact = 0
+        was_fact = orig_fact.copy()
+        for count in range(edit_count):
+            edit_fact = was_fact.copy()
+            edit_fact.end = start + timedelta(minutes=count + 1)
+            undo.append(UndoRedoTuple([was_fact], [edit_fact], 0, "bench"))
+            journal.edited_fact(edit_fact)
+            was_fact = edit_fact
+        journal.close()
+
+        with open(journal.path, "r", encoding="utf8") as journal_file:
+            records = [json.loads(line) for line in journal_file]
+        # The journal is rewritten with just its live records every so often,
+        # and each undo is journaled as its changes, not as copies of Facts.
+        assert len(records) <= JOURNAL_COMPACT_RECORDS + 1
+        assert all("deltas" in rec for rec in records if rec["op"] == "push")
+
+        replayed = replay_undo_journal(journal.path)
+        assert len(replayed.undo) == 100
+        assert replayed.edit_facts[1].end == start + timedelta(minutes=edit_count)
+        end_deltas = [d for d in replayed.undo[-1].deltas if d.attr == "end"]
+        assert end_deltas == [
+            FactDelta(
+                1,
+                "end",
+                start + timedelta(minutes=edit_count - 1),
+                start + timedelta(minutes=edit_count),
+            )
+        ]
@@ -0,0 +1,147 @@
+# This file exists within 'dob-viewer':
+#
+#   https://github.com/tallybark/dob-viewer
+#
+# Copyright © 2019-2020 Landon Bouma. All rights reserved.
+#
+# This program is free software:  you can redistribute it  and/or  modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3  of the License,  or  (at your option)  any later version  (GPLv3+).
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY;  without even the implied warranty of MERCHANTABILITY or  FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU  General  Public  License  for  more  details.
+#
+# If you lost the GNU General Public License that ships with this software
+# repository (read the 'LICENSE' file), see <http://www.gnu.org/licenses/>.
+
+"""Content lexer tests."""
+
+import pytest
+from prompt_toolkit.document import Document
+from prompt_toolkit.layout.utils import explode_text_fragments
+from prompt_toolkit.styles.named_colors import NAMED_COLORS
+
+from dob_viewer.ptkui import various_lexers
+
+CONTENT_WIDTH = 20
+
+DOCUMENT_TEXT = "\n".join(
+    (
+        "A short line.",
+        "",
+        "A line that runs on well past the content width, and then some.",
+        "A short line.",
+        "  Indented,  with  doubled  spaces. ",
+        "Exactly twenty chars",
+        "Twenty-one characters",
+    )
+)
+
+
+# ***
+
+# The lexers as they were, lexing the whole document at once, to check that
+# the per-line, cached lexing draws the same thing.
+
+
+def old_wordwrapper_lines(document, content_width):
+    return [
+        [("#00ff55", chunk)] for line in document.lines for chunk in line.split(" ")
+    ]
+
+
+def old_truncater_lines(document, content_width):
+    dots_cnt = 3
+    trunc_at = max(content_width - dots_cnt, 0)
+    lines = []
+    for line in document.lines:
+        if len(line) > content_width:
+            line = line[:trunc_at] + "━" * dots_cnt
+        lines.append([("#00ff55", c) for c in line])
+    return lines
+
+
+def old_rainbow_lines(document, content_width):
+    colors = list(sorted(NAMED_COLORS, key=NAMED_COLORS.get))
+    return [
+        [(colors[i % len(colors)], c) for i, c in enumerate(line)]
+        for line in document.lines
+    ]
+
+
+LEXERS = (
+    (various_lexers.wordwrapper, old_wordwrapper_lines),
+    (various_lexers.truncater, old_truncater_lines),
+    (various_lexers.rainbow, old_rainbow_lines),
+)
+
+
+def _lexer(lexer_factory, content_width=CONTENT_WIDTH):
+    lexer = lexer_factory()()
+    lexer.content_width = content_width
+    return lexer
+
+
+def _lex_lines(lexer, document, linenos):
+    get_line = lexer.lex_document(document)
+    # Compare what gets drawn, and not how it's split into fragments.
+    return [list(explode_text_fragments(get_line(lineno))) for lineno in linenos]
+
+
+# ***
+
+
+class TestVariousLexers(object):
+    """"""
+
+    @pytest.mark.parametrize(("lexer_factory", "old_lines"), LEXERS)
+    def test_lex_document_matches_old_output(self, lexer_factory, old_lines):
+        document = Document(DOCUMENT_TEXT)
+        expected = [
+            list(explode_text_fragments(fragments))
+            for fragments in old_lines(document, CONTENT_WIDTH)
+        ]
+        lexer = _lexer(lexer_factory)
+        linenos = range(len(expected))
+        assert _lex_lines(lexer, document, linenos) == expected
+        # Lexing again, now from the line cache, and out of order, is the same.
+        reverse = list(reversed(linenos))
+        assert _lex_lines(lexer, document, reverse) == [expected[i] for i in reverse]
+
+    @pytest.mark.parametrize("lexer_factory", [factory for factory, _ in LEXERS])
+    def test_cache_spans_documents(self, lexer_factory):
+        lexer = _lexer(lexer_factory)
+        _lex_lines(lexer, Document(DOCUMENT_TEXT), range(3))
+        cached = dict(lexer._line_tokens)
+        assert cached
+        # Another Fact's description, sharing a line, reuses the cached tokens.
+        tokens = lexer.lex_document(Document("A short line."))(0)
+        assert any(tokens is cached_tokens for cached_tokens in cached.values())
+        assert lexer._line_tokens == cached
+
+    @pytest.mark.parametrize(("lexer_factory", "old_lines"), LEXERS)
+    def test_width_change_clears_cache(self, lexer_factory, old_lines):
+        document = Document(DOCUMENT_TEXT)
+        lexer = _lexer(lexer_factory)
+        linenos = range(len(old_lines(document, CONTENT_WIDTH)))
+        _lex_lines(lexer, document, linenos)
+        assert lexer._line_tokens
+        # Setting the same width keeps the cache.
+        lexer.content_width = CONTENT_WIDTH
+        assert lexer._line_tokens
+        lexer.content_width = CONTENT_WIDTH + 10
+        assert not lexer._line_tokens
+        # And lines are lexed anew for the new width.
+        expected = [
+            list(explode_text_fragments(fragments))
+            for fragments in old_lines(document, CONTENT_WIDTH + 10)
+        ]
+        assert _lex_lines(lexer, document, linenos) == expected
+
+    def test_lexer_must_lex_lines(self):
+        class LineLessLexer(various_lexers.BaseLexer):
+            pass
+
+        with pytest.raises(TypeError):
+            LineLessLexer()